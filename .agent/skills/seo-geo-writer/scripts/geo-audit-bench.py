@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+GEO Audit Benchmark
+
+Times geo-audit.py on a deterministic synthetic corpus and compares the
+timings against a stored baseline, failing on regressions.
+
+Usage:
+    python geo-audit-bench.py
+    python geo-audit-bench.py --sizes 1K,1M --kinds cjk,links
+    python geo-audit-bench.py --save-baseline bench-baseline.json
+    python geo-audit-bench.py --baseline bench-baseline.json --threshold 0.25
+    python geo-audit-bench.py --write-corpus /tmp/geo-corpus --sizes 10K
+    python geo-audit-bench.py --verify
+    python geo-audit-bench.py --startup --startup-budget 40
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Callable
+
+
+sys.path.insert(0, str(Path(__file__).parent))
+import geo_audit as ga  # noqa: E402
+
+SIZES = {"1K": 1 << 10, "10K": 10 << 10, "100K": 100 << 10, "1M": 1 << 20, "10M": 10 << 20}
+
+# Building blocks for generated documents
+CJK_CHARS = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处理"
+LATIN_WORDS = (
+    "content search engine answer brand model data source guide strategy "
+    "ranking structure audit reader question page topic signal example "
+    "workflow growth metric customer team result method framework"
+).split()
+CJK_SIGNALS = ["我们发现", "在多年实践中", "根据研究", "立即注册", "免费试用", "40% 的用户", "3 倍"]
+LATIN_SIGNALS = ["In our experience", "according to research", "Sign up free", "40% of users", "3x faster"]
+
+KINDS = ("cjk", "latin", "mixed", "tables", "links", "longlines")
+
+
+class CorpusGenerator:
+    """Deterministic markdown documents by kind and size (same seed, same bytes)."""
+
+    def __init__(self, seed: int = 2026):
+        self.seed = seed
+
+    def document(self, kind: str, size: int) -> str:
+        rng = random.Random(f"{self.seed}:{kind}:{size}")
+        block = getattr(self, f"_block_{kind}")
+        parts = [f"# {kind} benchmark\n\n", self._paragraph(rng, "mixed", 40), "\n\n"]
+        length = sum(map(len, parts))
+        while length < size:
+            part = block(rng)
+            parts.append(part)
+            length += len(part)
+        return "".join(parts)[:size]
+
+    def _paragraph(self, rng, script: str, words: int) -> str:
+        out = []
+        for _ in range(words):
+            use_cjk = script == "cjk" or (script == "mixed" and rng.random() < 0.5)
+            if use_cjk:
+                out.append("".join(rng.choice(CJK_CHARS) for _ in range(rng.randint(2, 6))))
+            else:
+                out.append(rng.choice(LATIN_WORDS))
+            if rng.random() < 0.05:
+                out.append(rng.choice(CJK_SIGNALS if use_cjk else LATIN_SIGNALS))
+        sep = "" if script == "cjk" else " "
+        return sep.join(out) + ("。" if script == "cjk" else ".")
+
+    def _section(self, rng, script: str) -> str:
+        title = "如何提升内容质量？" if script == "cjk" else "How does content ranking work?"
+        lines = [f"## {title}\n\n", self._paragraph(rng, script, rng.randint(20, 80)), "\n\n"]
+        if rng.random() < 0.5:
+            lines += [f"- {self._paragraph(rng, script, 6)}\n" for _ in range(rng.randint(2, 6))]
+            lines.append("\n")
+        if rng.random() < 0.2:
+            lines.append("```python\nprint('## not a heading')\n```\n\n")
+        return "".join(lines)
+
+    def _block_cjk(self, rng) -> str:
+        return self._section(rng, "cjk")
+
+    def _block_latin(self, rng) -> str:
+        return self._section(rng, "latin")
+
+    def _block_mixed(self, rng) -> str:
+        return self._section(rng, "mixed")
+
+    def _block_tables(self, rng) -> str:
+        rows = ["| 指标 | Before | After |\n", "|---|---|---|\n"]
+        rows += [
+            f"| {rng.choice(LATIN_WORDS)} | {rng.randint(1, 99)}% | {rng.randint(1, 9)}x |\n"
+            for _ in range(rng.randint(5, 40))
+        ]
+        return "## 对比\n\n" + "".join(rows) + "\n"
+
+    def _block_links(self, rng) -> str:
+        links = []
+        for _ in range(rng.randint(5, 30)):
+            word = rng.choice(LATIN_WORDS)
+            target = (f"/blog/{word}-{rng.randint(1, 999)}" if rng.random() < 0.6
+                      else f"https://example.com/{word}")
+            links.append(f"[{word}]({target})")
+        return "See " + ", ".join(links) + ".\n\n"
+
+    def _block_longlines(self, rng) -> str:
+        # Near-misses for every scanner: unclosed links, gapped phrase leads
+        # with no tail, digits without units, pipes without a table.
+        fragments = ["[", "](", "[x](", "| ", "after ", "在", "我们", "$", "1 ", "x", " ", "#", "`"]
+        return "".join(rng.choice(fragments) for _ in range(rng.randint(20000, 60000))) + "\n"
+
+
+def measure(func: Callable, budget: float = 0.25, max_runs: int = 50) -> float:
+    """Best wall time of ``func`` over repeated runs filling about ``budget`` seconds."""
+    start = time.perf_counter()
+    func()      # warm-up, also the only run for slow cases
+    best = elapsed = time.perf_counter() - start
+    runs = 1
+    while elapsed < budget and runs < max_runs:
+        t = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        runs += 1
+    return best
+
+
+def bench_document(text: str, brand: str, budget: float) -> dict[str, float]:
+    """Time the whole audit and each stage of it on one document."""
+    lexicon = ga.get_lexicon(brand=brand)
+    timings = {
+        "audit_content": measure(lambda: ga.audit_content(text, brand, lexicon=lexicon), budget),
+        "parse_document": measure(lambda: ga.parse_document(text), budget),
+    }
+    doc = ga.parse_document(text)
+    timings["lexicon_scan"] = measure(lambda: lexicon.scan(doc.lower_text), budget)
+    doc.hits = lexicon.scan(doc.lower_text)
+    for auditor in ga.AUDITORS:
+        # A fresh copy per run so cached properties are recomputed
+        timings[auditor.func.__name__] = measure(
+            lambda: auditor.run(replace(doc), brand), budget)
+    return timings
+
+
+def run_benchmarks(kinds, sizes, seed: int, budget: float, progress) -> dict:
+    generator = CorpusGenerator(seed)
+    results = {}
+    for kind in kinds:
+        for label in sizes:
+            text = generator.document(kind, SIZES[label])
+            nbytes = len(text.encode("utf-8"))
+            timings = bench_document(text, "Acme", budget)
+            case = f"{kind}/{label}"
+            results[case] = {
+                "bytes": nbytes,
+                "seconds": timings,
+                "mb_per_s": round(nbytes / 1e6 / timings["audit_content"], 3),
+                "docs_per_s": round(1 / timings["audit_content"], 2),
+            }
+            progress(case, results[case])
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, floor: float) -> list[str]:
+    """Regressions beyond ``threshold`` (0.2 = 20% slower) against the baseline.
+
+    Timings under ``floor`` seconds in both runs are too noisy to compare.
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get("results", {}).get(case)
+        if not base:
+            continue
+        for name, seconds in result["seconds"].items():
+            before = base["seconds"].get(name)
+            if before is None or max(before, seconds) < floor:
+                continue
+            if seconds > before * (1 + threshold):
+                regressions.append(
+                    f"{case} {name}: {before * 1000:.2f} ms -> {seconds * 1000:.2f} ms "
+                    f"(+{(seconds / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def verify(seed: int, rounds: int) -> list[str]:
+    """Check the equivalences the fast paths promise; returns failures.
+
+    * incremental :class:`AuditState` edits score like a full ``audit_content``
+    * the default weights re-score feature vectors to the built-in score
+    * ``audit_chunked`` of a file, in tiny chunks, equals ``audit_content`` of its text
+    """
+    import tempfile
+
+    rng = random.Random(seed)
+    generator = CorpusGenerator(seed)
+    pieces = ["## 标题\n", "## ", "#", "```\n", "~~~\n", "---\n", "- item\n", "| a | b |\n",
+              "\n", "在多年实践中我们发现 40% 用户\n", "[doc](/a)", "Acme ", "after 3 projects"]
+    scorer = ga.get_scorer(None)
+    failures = []
+    for i in range(rounds):
+        kind = KINDS[i % len(KINDS)]
+        text = generator.document(kind, rng.choice([512, 2048, 8192]))
+        if i % 2:
+            text = "---\ntitle: x\n---\n" + text
+        state = ga.AuditState.start(text, "Acme")
+        for _ in range(10):
+            start = rng.randint(0, len(text))
+            end = min(len(text), start + rng.choice([0, 1, 5, 50, 500]))
+            insert = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 3)))
+            state = state.edit(start, end, insert)
+            text = text[:start] + insert + text[end:]
+            full = ga.audit_content(text, "Acme")
+            if asdict(state.result) != asdict(full):
+                failures.append(f"incremental audit differs after edit {start}:{end} of {kind} round {i}")
+                break
+            if scorer.score(full.details["features"]) != (full.score, full.passed):
+                failures.append(f"default weights re-score differs on {kind} round {i}")
+                break
+
+        # Tiny chunks put boundaries inside fences, frontmatter and paragraphs
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", suffix=".md") as f:
+            f.write(text.replace("\n", "\r\n") if i % 3 == 0 else text)
+            f.flush()
+            chunk_size = rng.choice([1, 7, 64, 1000])
+            streamed = ga.audit_chunked(f.name, "Acme", chunk_size=chunk_size)
+            if asdict(streamed) != asdict(ga.audit_content(Path(f.name).read_text(encoding="utf-8"), "Acme")):
+                failures.append(f"streamed audit differs in {chunk_size}-char chunks of {kind} round {i}")
+    return failures
+
+
+def parse_list(value: str, choices) -> list[str]:
+    items = [v for v in value.split(",") if v]
+    unknown = [v for v in items if v not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown: {', '.join(unknown)} (choose from {', '.join(choices)})")
+    return items
+
+
+def startup_times(seed: int, runs: int) -> dict[str, tuple[float, float]]:
+    """Median and best wall time (s) of fresh single-file runs of each CLI.
+
+    Modules are byte-compiled first, as they are after any earlier run, so
+    this measures interpreter start, imports and one small document.
+    """
+    import compileall
+    import statistics
+    import subprocess
+    import tempfile
+
+    here = Path(__file__).parent
+    for name in ("geo_audit.py", "schema_generator.py"):
+        compileall.compile_file(str(here / name), quiet=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        doc = Path(tmp, "article.md")
+        doc.write_text(CorpusGenerator(seed).document("mixed", SIZES["10K"]), encoding="utf-8")
+        commands = {
+            "geo-audit.py": [str(here / "geo-audit.py"), str(doc), "--cache-dir", tmp],
+            "schema-generator.py": [str(here / "schema-generator.py"), "--type", "article",
+                                    "--title", "Title", "--description", "Description", "--author", "Author"],
+        }
+        results = {}
+        for name, command in commands.items():
+            times = []
+            for _ in range(runs + 1):  # the first run warms the page and audit caches
+                start = time.perf_counter()
+                subprocess.run([sys.executable, *command], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, check=False)
+                times.append(time.perf_counter() - start)
+            results[name] = (statistics.median(times[1:]), min(times[1:]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GEO Audit Benchmark")
+    parser.add_argument("--kinds", type=lambda v: parse_list(v, KINDS), default=list(KINDS),
+                        help=f"Comma-separated document kinds (default: {','.join(KINDS)})")
+    parser.add_argument("--sizes", type=lambda v: parse_list(v, SIZES), default=list(SIZES),
+                        help=f"Comma-separated document sizes (default: {','.join(SIZES)})")
+    parser.add_argument("--seed", type=int, default=2026, help="Corpus seed (default: 2026)")
+    parser.add_argument("--budget", type=float, default=0.25,
+                        help="Seconds spent repeating each measurement (default: 0.25)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write these results as a baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed slowdown before failing, 0.2 = 20%% (default: 0.2)")
+    parser.add_argument("--floor", type=float, default=0.001,
+                        help="Ignore timings below this many seconds (default: 0.001)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument("--write-corpus", metavar="DIR",
+                        help="Write the generated documents to DIR and exit")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check incremental and re-scoring equivalence and exit")
+    parser.add_argument("--rounds", type=int, default=60, help="Documents checked by --verify")
+    parser.add_argument("--startup", action="store_true",
+                        help="Time single-file CLI invocations against --startup-budget and exit")
+    parser.add_argument("--startup-runs", type=int, default=20, help="Invocations per CLI (default: 20)")
+    parser.add_argument("--startup-budget", type=float, default=40.0,
+                        help="Allowed median wall time per invocation in ms (default: 40)")
+    args = parser.parse_args()
+
+    if args.write_corpus:
+        generator = CorpusGenerator(args.seed)
+        out = Path(args.write_corpus)
+        out.mkdir(parents=True, exist_ok=True)
+        for kind in args.kinds:
+            for label in args.sizes:
+                (out / f"{kind}-{label}.md").write_text(generator.document(kind, SIZES[label]), encoding="utf-8")
+        print(f"Wrote {len(args.kinds) * len(args.sizes)} documents to {out}")
+        return
+
+    if args.startup:
+        over = False
+        for name, (median, best) in startup_times(args.seed, args.startup_runs).items():
+            over |= median * 1000 > args.startup_budget
+            print(f"{name:<20} median {median * 1000:7.1f} ms  min {best * 1000:7.1f} ms")
+        print(f"startup: {'over' if over else 'within'} {args.startup_budget:g} ms budget")
+        sys.exit(1 if over else 0)
+
+    if args.verify:
+        failures = verify(args.seed, args.rounds)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        print("verify: ok" if not failures else f"verify: {len(failures)} failure(s)")
+        sys.exit(1 if failures else 0)
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read baseline: {e}", file=sys.stderr)
+            sys.exit(2)
+
+    def progress(case, result):
+        if not args.json:
+            t = result["seconds"]["audit_content"]
+            print(f"{case:<16} {result['bytes'] / 1e6:>8.3f} MB  {t * 1000:>10.2f} ms  "
+                  f"{result['mb_per_s']:>8.2f} MB/s  {result['docs_per_s']:>9.2f} docs/s", flush=True)
+
+    results = run_benchmarks(args.kinds, args.sizes, args.seed, args.budget, progress)
+    report = {
+        "python": sys.version.split()[0],
+        "seed": args.seed,
+        "results": results,
+    }
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.floor)
+        report["regressions"] = regressions
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        # Per-stage breakdown, slowest stages first
+        print(f"\n{'case':<16} {'stage':<26} {'ms':>10}")
+        for case, result in results.items():
+            stages = sorted(result["seconds"].items(), key=lambda kv: -kv[1])
+            for name, seconds in stages:
+                print(f"{case:<16} {name:<26} {seconds * 1000:>10.3f}")
+        if args.baseline:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} vs {args.baseline}")
+            for line in regressions:
+                print(f"  • {line}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
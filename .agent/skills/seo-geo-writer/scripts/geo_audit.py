@@ -0,0 +1,3915 @@
+#!/usr/bin/env python3
+"""
+GEO Content Audit Script
+
+Analyzes markdown content for GEO (Generative Engine Optimization) readiness.
+Checks AI extractability, structure, and citation potential.
+
+Usage:
+    python geo-audit.py content.md
+    python geo-audit.py content.md --brand "Scale to Top"
+    python geo-audit.py content.md --json
+    python geo-audit.py content/ "posts/**/*.md" --jobs 8
+    python geo-audit.py content/ --dictionary brands.json --locale zh,en
+    python geo-audit.py content.md --no-cache
+    python geo-audit.py content/ --profile 2> hotspots.txt
+    python geo-audit.py kb-export.md --stream-above 16 --time-budget 0
+    python geo-audit.py content/ --checks headings,direct_answer,links
+    python geo-audit.py --list-checks
+    python geo-audit.py serve --socket /tmp/geo-audit.sock
+    export-articles | python geo-audit.py --stdin-ndjson --order completed
+    python geo-audit.py --git-range origin/main...HEAD
+    python geo-audit.py content/ --features-out corpus.features
+    python geo-audit.py content/ --table-out audit.csv --lang en
+    python geo-audit.py content/ --summary --summary-out shard-1.json
+    python geo-audit.py summary shard-*.json
+    python geo-audit.py rescore corpus.features --weights weights.json
+    python geo-audit.py links content/ --base-path /blog --graph-out links.json
+    python geo-audit.py content/ --link-graph links.json
+    python geo-audit.py dupes content/ --threshold 0.8 --db signatures.sqlite3
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, asdict, astuple, field, replace
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+# Built-in vocabulary, overridable per locale with --dictionary. Phrases are
+# matched case-insensitively; "lead...tail" means lead then tail on one line.
+DEFAULT_DICTIONARY = {
+    "brands": {},
+    "locales": {
+        "zh": {
+            "cta": ["下载", "获取", "免费", "模板", "清单", "指南", "工具", "立即", "开始", "试用"],
+            "experience": ["我们发现", "我们的经验", "在...实践中", "经过...测试", "通过...验证"],
+            "citation": ["根据", "研究表明", "数据显示", "来源:"],
+        },
+        "en": {
+            "cta": ["download", "get", "free", "template", "checklist", "guide", "tool", "now", "start", "try"],
+            "experience": ["in our experience", "we found", "we discovered", "after...projects"],
+            "citation": ["according to", "source:"],
+        },
+    },
+}
+
+
+@dataclass
+class AuditResult:
+    """Audit result with score and details."""
+    passed: bool
+    score: int
+    max_score: int
+    issues: list[dict]          # {"code": ..., **params}; see render_issue()
+    suggestions: list[dict]
+    details: dict
+
+
+# Script ranges, shared by the str and UTF-8 segmenters below
+HAN_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0003ffff'
+KANA_RANGES = '\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f'
+HANGUL_RANGES = '\u1100-\u11ff\u3130-\u318f\uac00-\ud7af'
+_SCRIPTS = HAN_RANGES + KANA_RANGES + HANGUL_RANGES
+
+# Han, kana and Hangul count per character; any other whitespace-separated
+# run is one word, Latin if it holds a letter, else digits if it holds a
+# digit. Leading whitespace is consumed by the match; a bare \Z ends the scan.
+_RUN = rf'[^\s{_SCRIPTS}]'
+SEGMENT_PATTERN = re.compile(
+    rf'\s*+(?:(?P<latin>{_RUN}*?[^\W\d_{_SCRIPTS}]{_RUN}*+)'
+    rf'|(?P<han>[{HAN_RANGES}]+)|(?P<kana>[{KANA_RANGES}]+)|(?P<hangul>[{HANGUL_RANGES}]+)'
+    rf'|(?P<digits>{_RUN}*?\d{_RUN}*+)|(?P<other>{_RUN}++)|\Z)'
+)
+
+# The same split over UTF-8 bytes, so mmap/memoryview input is scanned in
+# place. Scripts and whitespace match exactly; letters are exact for ASCII,
+# Latin-1 and fullwidth forms, and otherwise taken to be U+0100-U+1FFF.
+_CONT = rb'[\x80-\xbf]'
+_HAN3 = (rb'(?:[\xe5-\xe9]' + _CONT + _CONT + rb'|\xe4[\x80-\xb6\xb8-\xbf]' + _CONT
+         + rb'|\xe3[\x90-\xbf]' + _CONT + rb'|\xef[\xa4-\xab]' + _CONT + rb')')
+_HAN4 = rb'\xf0[\xa0-\xbf]' + _CONT + _CONT
+_KANA = rb'(?:\xe3[\x81-\x83]' + _CONT + rb'|\xe3\x87[\xb0-\xbf]|\xef\xbd[\xa6-\xbf]|\xef\xbe[\x80-\x9f])'
+_HANGUL = (rb'(?:\xe1[\x84-\x87]' + _CONT + rb'|\xe3\x84[\xb0-\xbf]|\xe3\x85' + _CONT
+           + rb'|\xe3\x86[\x80-\x8f]|\xea[\xb0-\xbf]' + _CONT + rb'|[\xeb\xec]' + _CONT + _CONT
+           + rb'|\xed[\x80-\x9d]' + _CONT + rb'|\xed\x9e[\x80-\xaf])')
+_SPACE = (rb'(?:[\t-\r\x1c- ]|\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]'
+          rb'|\xe2\x81\x9f|\xe3\x80\x80)')
+# Any other non-space character, spelled out by UTF-8 range (malformed
+# sequences match nothing and so separate words)
+_WIDE = (rb'(?:\xc2[\x80-\x84\x86-\x9f\xa1-\xbf]|[\xc3-\xdf]' + _CONT
+         + rb'|\xe2[\x82-\xbf]' + _CONT + rb'|\xe2\x80[\x8b-\xa7\xaa-\xae\xb0-\xbf]|\xe2\x81[\x80-\x9e\xa0-\xbf]'
+         + rb'|\xe3\x80[\x81-\xbf]|\xe3\x84[\x80-\xaf]|\xe3\x86[\x90-\xbf]|\xe3\x87[\x80-\xaf]|\xe3[\x88-\x8f]' + _CONT
+         + rb'|\xef[\x80-\xa3\xac-\xbc]' + _CONT + rb'|\xef\xbd[\x80-\xa5]|\xef\xbe[\xa0-\xbf]|\xef\xbf' + _CONT
+         + rb'|(?:\xe0' + _CONT + rb'|\xe1[\x80-\x83\x88-\x99\x9b-\xbf]|\xe4\xb7|\xea[\x80-\xaf]|\xed[\x9f-\xbf]|\xee'
+         + _CONT + rb')' + _CONT + rb'|\xe1\x9a[\x81-\xbf]|\xed\x9e[\xb0-\xbf]'
+         + rb'|\xf0[\x80-\x9f]' + _CONT + _CONT + rb'|[\xf1-\xf4]' + _CONT + _CONT + _CONT + rb')')
+_ASCII = rb'[\x00-\x08\x0e-\x1b!-\x7f]'
+_CHAR = rb'(?:' + _ASCII + rb'|' + _WIDE + rb')'
+_TAIL = rb'(?:' + _ASCII + rb'++|' + _WIDE + rb')*+'
+_LETTER = (rb'(?:[A-Za-z]|\xc2[\xaa\xb5\xba]|\xc3[\x80-\x96\x98-\xb6\xb8-\xbf]|[\xc4-\xdf]' + _CONT
+           + rb'|(?:\xe0' + _CONT + rb'|\xe1[\x80-\x83\x88-\x99\x9b-\xbf]|\xe1\x9a[\x81-\xbf])' + _CONT
+           + rb'|\xef\xbc[\xa1-\xba]|\xef\xbd[\x81-\x9a])')
+_DIGIT = rb'(?:[0-9]|\xef\xbc[\x90-\x99])'
+SEGMENT_SOURCE_BYTES = (
+    _SPACE + rb'*+(?:(?P<latin>' + _CHAR + rb'*?' + _LETTER + _TAIL + rb')'
+    rb'|(?P<han>(?:' + _HAN3 + rb')+)|(?P<han4>(?:' + _HAN4 + rb')+)'
+    rb'|(?P<kana>' + _KANA + rb'+)|(?P<hangul>' + _HANGUL + rb'+)'
+    rb'|(?P<digits>' + _CHAR + rb'*?' + _DIGIT + _TAIL + rb')'
+    rb'|(?P<other>' + _CHAR + rb'++)|\Z)'
+)
+
+
+@lru_cache(maxsize=None)
+def segment_pattern_bytes() -> re.Pattern:
+    """The UTF-8 segment pattern, compiled on first use: only mmap and
+    bytes input need it, and it costs milliseconds of every cold start."""
+    return re.compile(SEGMENT_SOURCE_BYTES)
+
+
+# Per input kind and group number: the ScriptCounts field it tallies and the
+# match length of one counted character (0: the whole match is one word)
+_SEGMENT_GROUPS = {
+    str: [None, ("latin", 0), ("han", 1), ("kana", 1), ("hangul", 1), ("digits", 0), ("other", 0)],
+    bytes: [None, ("latin", 0), ("han", 3), ("han", 4), ("kana", 3), ("hangul", 3),
+            ("digits", 0), ("other", 0)],
+}
+
+
+@dataclass(frozen=True)
+class ScriptCounts:
+    """Words per script: one per Han, kana or Hangul character, one per run otherwise."""
+    han: int = 0
+    kana: int = 0
+    hangul: int = 0
+    latin: int = 0
+    digits: int = 0
+    other: int = 0
+
+    @property
+    def words(self) -> int:
+        return self.han + self.kana + self.hangul + self.latin + self.digits + self.other
+
+    def __add__(self, other: "ScriptCounts") -> "ScriptCounts":
+        return ScriptCounts(*(a + b for a, b in zip(astuple(self), astuple(other))))
+
+
+def segment(data) -> ScriptCounts:
+    """Count words per script in one pass over a str or UTF-8 bytes-like object.
+
+    bytes, memoryview and mmap input is matched in place, without decoding.
+    """
+    if isinstance(data, str):
+        pattern, groups = SEGMENT_PATTERN, _SEGMENT_GROUPS[str]
+    else:
+        pattern, groups = segment_pattern_bytes(), _SEGMENT_GROUPS[bytes]
+    tally = [0] * len(groups)
+    for m in pattern.finditer(data):
+        i = m.lastindex
+        if i is None:
+            continue
+        width = groups[i][1]
+        if width:
+            start, end = m.span(i)
+            tally[i] += (end - start) // width
+        else:
+            tally[i] += 1
+    counts = dict.fromkeys(ScriptCounts.__dataclass_fields__, 0)
+    for (name, _), n in zip(groups[1:], tally[1:]):
+        counts[name] += n
+    return ScriptCounts(**counts)
+
+
+def count_words(text) -> int:
+    """Count words, handling CJK (Han, kana, Hangul) and Latin text."""
+    return segment(text).words
+
+
+@dataclass(slots=True)
+class Heading:
+    """ATX heading with its level and offset in the source."""
+    level: int
+    text: str
+    offset: int
+
+
+@dataclass(slots=True)
+class Link:
+    """Inline markdown link ``[text](target)`` with its offset in the source."""
+    text: str
+    target: str
+    offset: int
+
+
+@dataclass
+class Document:
+    """Single-pass parse of a markdown document, shared by all auditors.
+
+    Offsets are character offsets into ``text``. Lines inside code fences
+    never count as headings, list items, table rows or links.
+    """
+    text: str
+    frontmatter: dict[str, str] = field(default_factory=dict)
+    headings: dict[int, list[Heading]] = field(default_factory=dict)
+    paragraphs: list[tuple[int, int]] = field(default_factory=list)
+    first_paragraph: str = ""
+    list_items: list[int] = field(default_factory=list)
+    table_rows: list[int] = field(default_factory=list)
+    code_fences: list[tuple[int, int, str]] = field(default_factory=list)
+    links: list[Link] = field(default_factory=list)
+    unclosed: bool = False    # text ended inside a code fence or frontmatter
+    state: Optional["ParseState"] = None    # where a non-final chunk's parse stopped
+    hits: Optional["LexiconHits"] = None
+    deadline: Optional[float] = None
+
+    def headings_at(self, level: int) -> list[Heading]:
+        return self.headings.get(level, [])
+
+    @cached_property
+    def lower_text(self) -> str:
+        """Lower-cased text for case-insensitive phrase matching."""
+        return self.text.lower()
+
+    @cached_property
+    def script_counts(self) -> "ScriptCounts":
+        """Words per script in the whole text."""
+        return segment(self.text)
+
+    @cached_property
+    def has_data(self) -> bool:
+        """Whether the text cites numbers (percentages, multiples, money, user counts)."""
+        return any(p.search(self.text) for p in DATA_PATTERNS)
+
+    def check_deadline(self):
+        """Raise :class:`AuditTimeout` once the audit's time budget is spent."""
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise AuditTimeout()
+
+
+class AuditTimeout(Exception):
+    """Raised when an audit runs past its per-document time budget."""
+
+
+@dataclass
+class ParseState:
+    """Parser state carried from one chunk of a document to the next.
+
+    Offsets are relative to the start of the next chunk, so anything opened
+    in an earlier chunk has a negative start. ``lead`` holds the raw text
+    so far of a paragraph that may still become the first paragraph.
+    """
+    fence: str = ''
+    fence_start: int = 0
+    fence_info: str = ''
+    frontmatter: bool = False
+    first_line: bool = True
+    para_start: Optional[int] = None
+    para_end: int = 0
+    lead: str = ''
+    paragraphs: int = 0       # paragraphs closed in earlier chunks
+
+
+# Every pattern below runs in time linear in the line or document length.
+# Signals are line-scoped: a match never spans a newline.
+# Data signals keep one-character prefixes ("\d+%" → "\d%"): the match set
+# is unchanged, but no quantified run is ever re-scanned from a later start.
+DATA_PATTERNS = tuple(re.compile(p) for p in (
+    r'\d%',
+    r'\d[^\S\n]*[倍x×]',
+    r'\$[\d,]',
+    r'[\d,][^\S\n]*(?:用户|users|客户|customers)',
+))
+DEFINITION_PATTERN = re.compile(r'(是|为|指|means|is|refers to|defined as)')
+QUESTION_HEADING_PATTERN = re.compile(r'[?？]|^(What|How|Why|When|Which|是什么|为什么|如何|怎么)')
+LIST_MARKERS = frozenset('-*+0123456789')
+
+
+def _heading_level(line: str) -> int:
+    """Return the ATX heading level of a line, or 0 if it is not a heading."""
+    level = len(line) - len(line.lstrip('#'))
+    if not 1 <= level <= 6 or len(line) == level or line[level] not in ' \t':
+        return 0
+    return level if line[level:].strip() else 0
+
+
+def _is_list_item(stripped: str) -> bool:
+    """Whether a left-stripped line is a bullet or numbered list item."""
+    if stripped[:1] in ('-', '*', '+'):
+        return stripped[1:2] in (' ', '\t') and bool(stripped[2:].strip())
+    digits = len(stripped) - len(stripped.lstrip('0123456789'))
+    return (digits > 0 and stripped[digits:digits + 1] == '.'
+            and stripped[digits + 1:digits + 2] in (' ', '\t')
+            and bool(stripped[digits + 2:].strip()))
+
+
+def _is_table_row(line: str) -> bool:
+    """Whether a line holds two pipes with something between them."""
+    first = line.find('|')
+    return first >= 0 and line.rfind('|') - first >= 2
+
+
+def _iter_links(line: str) -> Iterator[tuple[str, str, int]]:
+    """Yield ``(text, target, column)`` for each ``[text](target)`` in a line.
+
+    Equivalent to the regex ``\\[([^\\]]+)\\]\\(([^)]+)\\)`` but linear: every
+    ``[`` before the same ``]`` shares one outcome, so each is tried once.
+    """
+    start = line.find('[')
+    while start >= 0:
+        close = line.find(']', start + 1)
+        if close < 0:
+            return
+        if close == start + 1:
+            start = line.find('[', close)
+            continue
+        if line.startswith('(', close + 1):
+            end = line.find(')', close + 2)
+            if end < 0:
+                return
+            if end > close + 2:
+                yield line[start + 1:close], line[close + 2:end], start
+                start = line.find('[', end + 1)
+                continue
+        start = line.find('[', close + 1)
+
+
+def _fence_marker(line: str) -> str:
+    """Return the opening fence marker (backticks or tildes) of a line, or ''."""
+    stripped = line.lstrip(' ')
+    if len(line) - len(stripped) > 3 or stripped[:3] not in ('```', '~~~'):
+        return ''
+    char = stripped[0]
+    return stripped[:len(stripped) - len(stripped.lstrip(char))]
+
+
+def parse_document(
+    text: str,
+    deadline: Optional[float] = None,
+    frontmatter: bool = True,
+    state: Optional[ParseState] = None,
+    final: bool = True,
+    links: bool = True,
+) -> Document:
+    """Parse markdown into a :class:`Document` in one pass over its lines.
+
+    ``deadline`` is a ``time.perf_counter()`` value; parsing raises
+    :class:`AuditTimeout` once it has passed. ``frontmatter=False`` parses
+    text from the middle of a document, where ``---`` is not frontmatter.
+    ``links=False`` skips link extraction.
+
+    A document can also be parsed chunk by chunk: every chunk but the last
+    ends with a newline and is parsed with ``final=False``, which leaves
+    open fences, frontmatter and paragraphs in ``doc.state`` for the next
+    chunk's ``state``. Offsets stay relative to each chunk.
+    """
+    doc = Document(text=text, deadline=deadline)
+    if state is None:
+        state = ParseState(frontmatter=frontmatter and text.startswith('---'))
+    fence = state.fence   # open fence marker, '' when outside a code fence
+    fence_start = state.fence_start
+    fence_info = state.fence_info
+    para_start = state.para_start   # start offset of the current paragraph, None if none
+    para_end = state.para_end
+    in_frontmatter = state.frontmatter
+    carried, seen = state.lead, state.paragraphs
+
+    def close_paragraph():
+        nonlocal para_start
+        if para_start is not None:
+            doc.paragraphs.append((para_start, para_end))
+            if len(doc.paragraphs) + seen == 1:
+                doc.first_paragraph = (carried + text[max(para_start, 0):max(para_end, 0)]).strip()
+            para_start = None
+
+    pos = 0
+    length = len(text)
+    last = length if final else length - 1     # a non-final chunk ends with its newline
+    first_line = state.first_line
+    line_no = 0
+    while pos <= last:
+        line_no += 1
+        if not line_no & 1023:
+            doc.check_deadline()
+        end = text.find('\n', pos)
+        if end < 0:
+            end = length
+        line = text[pos:end].rstrip('\r')
+        offset, pos = pos, end + 1
+
+        if in_frontmatter:
+            if first_line:
+                first_line = False
+                if line.strip() != '---':
+                    in_frontmatter = False
+                else:
+                    continue
+            elif line.strip() in ('---', '...'):
+                in_frontmatter = False
+                continue
+            else:
+                key, sep, value = line.partition(':')
+                if sep and key.strip() and not key.startswith((' ', '\t', '-')):
+                    doc.frontmatter[key.strip()] = value.strip().strip('"\'')
+                continue
+
+        if fence:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                doc.code_fences.append((fence_start, end, fence_info))
+                fence = ''
+            continue
+
+        stripped = line.lstrip()
+        if not stripped:
+            if para_start is not None:
+                close_paragraph()
+            continue
+
+        lead = stripped[0]
+        marker = _fence_marker(line) if lead in '`~' else ''
+        if marker:
+            close_paragraph()
+            fence, fence_start = marker, offset
+            fence_info = stripped[len(marker):].strip()
+            continue
+
+        if links and '[' in line:
+            for link_text, target, column in _iter_links(line):
+                doc.links.append(Link(link_text, target, offset + column))
+
+        level = _heading_level(line) if lead == '#' else 0
+        if level:
+            close_paragraph()
+            doc.headings.setdefault(level, []).append(
+                Heading(level, line[level:].strip(), offset))
+        elif lead in LIST_MARKERS and _is_list_item(stripped):
+            close_paragraph()
+            doc.list_items.append(offset)
+        elif _is_table_row(line):
+            close_paragraph()
+            doc.table_rows.append(offset)
+        else:
+            if para_start is None:
+                para_start = offset
+            para_end = end
+
+    if not final:
+        opened = para_start is not None and not doc.paragraphs and not seen
+        doc.state = ParseState(
+            fence, fence_start - length, fence_info, in_frontmatter, first_line,
+            None if para_start is None else para_start - length, para_end - length,
+            carried + text[max(para_start, 0):] if opened else '', seen + len(doc.paragraphs))
+        return doc
+
+    # An unclosed fence runs to the end of the document
+    if fence:
+        doc.code_fences.append((fence_start, length, fence_info))
+    doc.unclosed = bool(fence) or in_frontmatter
+    close_paragraph()
+    return doc
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: finds every occurrence of every term in one pass."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = list(dict.fromkeys(terms))
+        goto: list[dict[str, int]] = [{}]
+        out: list[tuple[int, ...]] = [()]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] += (index,)
+
+        # Breadth-first failure links; outputs inherit their fallback's outputs.
+        # delta[s] folds the failure chain into direct transitions, keeping only
+        # those that differ from the root's, so scanning never walks fail links.
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [{} for _ in goto]
+        queue = deque(root.values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                out[nxt] += out[fail[nxt]]
+            merged = {**delta[fail[state]], **goto[state]}
+            delta[state] = {ch: nxt for ch, nxt in merged.items() if root.get(ch) != nxt}
+
+        self._root = root
+        self._delta = delta
+        self._out = out
+
+    def iter_matches(self, text: str, deadline: Optional[float] = None) -> Iterator[tuple[int, int]]:
+        """Yield ``(end, term_index)`` for every occurrence, by end offset."""
+        root, delta, out = self._root, self._delta, self._out
+        root_get = root.get
+        state = 0
+        for block in range(0, len(text), 1 << 16):
+            if deadline is not None and time.perf_counter() > deadline:
+                raise AuditTimeout()
+            for i, ch in enumerate(text[block:block + (1 << 16)], block):
+                if state:
+                    state = delta[state].get(ch) or root_get(ch, 0)
+                elif ch in root:
+                    state = root[ch]
+                else:
+                    continue
+                if out[state]:
+                    for index in out[state]:
+                        yield i + 1, index
+
+
+@dataclass
+class LexiconHits:
+    """Dictionary matches in one document."""
+    categories: dict[str, int] = field(default_factory=dict)
+    brands: dict[str, int] = field(default_factory=dict)
+
+
+class Lexicon:
+    """A keyword dictionary (brands, aliases and per-locale phrases) compiled
+    into a single :class:`KeywordAutomaton`."""
+
+    def __init__(self, dictionary: dict, locales: Optional[Iterable[str]] = None):
+        locales = set(locales) if locales else None
+        self.brands: dict[str, list[str]] = {
+            name: [name, *aliases] for name, aliases in dictionary.get("brands", {}).items()
+        }
+        # category → phrases, each phrase a tuple of ordered same-line parts
+        self.phrases: dict[str, list[tuple[str, ...]]] = {}
+        for locale, categories in dictionary.get("locales", {}).items():
+            if locales and locale not in locales:
+                continue
+            for category, phrases in categories.items():
+                bucket = self.phrases.setdefault(category, [])
+                bucket.extend(tuple(p.lower().split('...')) for p in phrases)
+
+        # term → targets: ("brand", name) or ("phrase", phrase id, part index)
+        targets: dict[str, list[tuple]] = {}
+        for name, terms in self.brands.items():
+            for term in terms:
+                targets.setdefault(term.lower(), []).append(("brand", name))
+        self._phrase_category: list[str] = []
+        self._phrase_parts: list[tuple[str, ...]] = []
+        for category, phrases in self.phrases.items():
+            for parts in phrases:
+                phrase_id = len(self._phrase_parts)
+                self._phrase_category.append(category)
+                self._phrase_parts.append(parts)
+                for part_index, part in enumerate(parts):
+                    targets.setdefault(part, []).append(("phrase", phrase_id, part_index))
+
+        self.brand_stamp = _stamp(self.brands)
+        self.phrase_stamp = _stamp(self.phrases)
+        self.automaton = KeywordAutomaton(targets)
+        # Highest part index first, so one occurrence never advances a phrase twice
+        self._targets = [
+            sorted(targets[term], key=lambda t: -t[2] if t[0] == "phrase" else 1)
+            for term in self.automaton.terms
+        ]
+
+    def canonical_brand(self, brand: str) -> Optional[str]:
+        """Dictionary name for ``brand`` or one of its aliases, if present."""
+        key = brand.lower()
+        for name, terms in self.brands.items():
+            if any(t.lower() == key for t in terms):
+                return name
+        return None
+
+    def scan(self, text: str, deadline: Optional[float] = None) -> LexiconHits:
+        """Count phrase and brand mentions in lower-cased ``text`` in one pass.
+
+        Overlapping mentions of one brand (e.g. an alias inside the full
+        name) count once. A gapped phrase counts when all of its parts occur
+        in order on a single line.
+        """
+        hits = LexiconHits(
+            categories=dict.fromkeys(self.phrases, 0),
+            brands=dict.fromkeys(self.brands, 0),
+        )
+        terms = self.automaton.terms
+        last_span: dict[str, tuple[int, int]] = {}
+        progress: dict[int, tuple[int, int]] = {}   # phrase id → (next part, end of last part)
+
+        for end, index in self.automaton.iter_matches(text, deadline):
+            start = end - len(terms[index])
+            for target in self._targets[index]:
+                if target[0] == "brand":
+                    name = target[1]
+                    prev = last_span.get(name)
+                    if prev is None or start >= prev[1]:
+                        hits.brands[name] += 1
+                        last_span[name] = (start, end)
+                    elif start <= prev[0]:
+                        last_span[name] = (start, end)  # longer mention containing the last
+                    continue
+
+                _, phrase_id, part = target
+                parts = self._phrase_parts[phrase_id]
+                expected, prev_end = progress.get(phrase_id, (0, 0))
+                if part == 0 and expected and text.find('\n', prev_end, start) >= 0:
+                    expected = 0  # partial match left over from an earlier line
+                if part != expected or start < prev_end:
+                    continue
+                if part and text.find('\n', prev_end, start) >= 0:
+                    continue
+                if part + 1 == len(parts):
+                    hits.categories[self._phrase_category[phrase_id]] += 1
+                    progress[phrase_id] = (0, end)
+                else:
+                    progress[phrase_id] = (part + 1, end)
+        return hits
+
+
+def _stamp(obj) -> str:
+    """Short stable digest of a JSON-serializable value."""
+    import hashlib
+
+    data = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def load_dictionary(path: Optional[str] = None) -> dict:
+    """Load a keyword dictionary, layered over :data:`DEFAULT_DICTIONARY`.
+
+    The file is JSON with optional ``brands`` (name → aliases) and
+    ``locales`` (locale → category → phrases) keys. Categories given in the
+    file replace the built-in list for that locale.
+    """
+    dictionary = {
+        "brands": dict(DEFAULT_DICTIONARY["brands"]),
+        "locales": {k: dict(v) for k, v in DEFAULT_DICTIONARY["locales"].items()},
+    }
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            custom = json.load(f)
+        dictionary["brands"].update(custom.get("brands", {}))
+        for locale, categories in custom.get("locales", {}).items():
+            dictionary["locales"].setdefault(locale, {}).update(categories)
+    return dictionary
+
+
+@lru_cache(maxsize=64)
+def get_lexicon(
+    dictionary_path: Optional[str] = None,
+    locales: Optional[tuple[str, ...]] = None,
+    brand: Optional[str] = None,
+) -> Lexicon:
+    """Compile (once per process) the lexicon for a dictionary and brand."""
+    dictionary = load_dictionary(dictionary_path)
+    if brand:
+        known = Lexicon({"brands": dictionary["brands"]}).canonical_brand(brand)
+        if known is None:
+            dictionary["brands"][brand] = []
+    return Lexicon(dictionary, locales)
+
+
+# Issue and suggestion messages per display language, keyed by stable code.
+# Results carry only ``{"code": ..., **params}``; text is rendered for
+# display (list parameters are joined with ", ").
+MESSAGES = {
+    "zh": {
+        "FIRST_PARA_LONG": "首段 {words} 字/词，建议精简至 60 以内便于 AI 提取",
+        "FIRST_PARA_TOO_LONG": "首段过长（{words} 字/词），AI 难以快速提取核心答案",
+        "NO_DEFINITION": "首段建议使用「X 是...」或「X refers to...」的定义句式",
+        "H1_MISSING": "缺少 H1 标题",
+        "H1_MULTIPLE": "存在 {count} 个 H1 标题，应只有 1 个",
+        "H2_TOO_FEW": "H2 标题数量偏少（{count}），建议 3-7 个主要章节",
+        "H2_TOO_MANY": "H2 标题数量较多（{count}），内容可能需要重组",
+        "NO_LISTS": "建议添加列表来组织要点，增强可扫描性和 AI 提取性",
+        "NO_TABLES": "对比类内容建议使用表格展示",
+        "BRAND_WEAK": "品牌「{brand}」仅出现 {count} 次，建议在方法论/框架处自然绑定",
+        "BRAND_MISSING": "内容缺少品牌「{brand}」绑定，难以被 AI 归因引用",
+        "NO_CTA": "建议添加低摩擦 CTA（如：模板下载、Checklist、免费工具等）",
+        "INTERNAL_LINKS_FEW": "内链数量偏少（{count}），建议 3-5 个相关内链",
+        "INTERNAL_LINKS_MISSING": "缺少内链，建议添加 3-5 个相关文章链接",
+        "NO_EXPERIENCE": "建议添加第一手经验表述（如：「我们在 X 项目中发现...」）",
+        "NO_DATA": "建议添加具体数据或统计支撑观点",
+        "NO_CITATIONS": "建议添加权威来源引用增强可信度",
+        "BROKEN_LINKS": "存在 {count} 个失效内链：{targets}",
+        "ORPHAN_PAGE": "孤立页面：没有其他文章链接到本文，建议从相关文章添加内链",
+        "AUDIT_TIMEOUT": "审计超时（超过 {seconds:g} 秒），未能完成检查",
+    },
+    "en": {
+        "FIRST_PARA_LONG": "First paragraph has {words} words; keep it under 60 so AI can extract it",
+        "FIRST_PARA_TOO_LONG": "First paragraph is too long ({words} words) for AI to extract a core answer",
+        "NO_DEFINITION": "Open with a definition sentence (\"X is...\" / \"X refers to...\")",
+        "H1_MISSING": "Missing H1 heading",
+        "H1_MULTIPLE": "{count} H1 headings; there should be exactly 1",
+        "H2_TOO_FEW": "Few H2 headings ({count}); aim for 3-7 main sections",
+        "H2_TOO_MANY": "Many H2 headings ({count}); the content may need restructuring",
+        "NO_LISTS": "Add lists to organize key points for scanning and AI extraction",
+        "NO_TABLES": "Use a table for comparisons",
+        "BRAND_WEAK": "Brand \"{brand}\" appears only {count} time(s); bind it to your method or framework",
+        "BRAND_MISSING": "Brand \"{brand}\" never appears, so AI cannot attribute the content",
+        "NO_CTA": "Add a low-friction CTA (template download, checklist, free tool...)",
+        "INTERNAL_LINKS_FEW": "Few internal links ({count}); aim for 3-5 related links",
+        "INTERNAL_LINKS_MISSING": "No internal links; add 3-5 links to related articles",
+        "NO_EXPERIENCE": "Add first-hand experience (\"In our work with X, we found...\")",
+        "NO_DATA": "Back claims with specific data or statistics",
+        "NO_CITATIONS": "Cite authoritative sources",
+        "BROKEN_LINKS": "{count} broken internal link(s): {targets}",
+        "ORPHAN_PAGE": "Orphan page: no other article links here; add links from related articles",
+        "AUDIT_TIMEOUT": "Audit timed out (over {seconds:g} s) before finishing",
+    },
+}
+DEFAULT_LANG = "zh"
+
+
+def issue(code: str, **params) -> dict:
+    """An issue or suggestion: its stable ``code`` plus parameters."""
+    return {"code": code, **params}
+
+
+def render_issue(item: dict, lang: str = DEFAULT_LANG) -> str:
+    """Render a coded issue or suggestion in ``lang`` (falling back to the default)."""
+    code = item["code"]
+    template = MESSAGES.get(lang, {}).get(code) or MESSAGES[DEFAULT_LANG].get(code)
+    params = {k: ", ".join(map(str, v)) if isinstance(v, list) else v
+              for k, v in item.items() if k != "code"}
+    if template is None:        # e.g. a third-party auditor's code
+        return f"{code} {json.dumps(params, ensure_ascii=False)}" if params else code
+    return template.format(**params)
+
+
+def localize(record: dict, lang: Optional[str]) -> dict:
+    """Render a result record's issues and suggestions in ``lang``, in place.
+
+    ``None`` keeps the codes.
+    """
+    if lang:
+        for key in ("issues", "suggestions"):
+            if key in record:
+                record[key] = [render_issue(item, lang) for item in record[key]]
+    return record
+
+
+def audit_direct_answer(doc: Document) -> tuple[int, list[dict], list[dict]]:
+    """Check if content has a clear direct answer in the first paragraph."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    first_para = doc.first_paragraph
+    word_count = count_words(first_para)
+
+    # Check length (ideal: 30-60 words/chars)
+    if word_count <= 60:
+        score += 15
+    elif word_count <= 100:
+        score += 10
+        suggestions.append(issue("FIRST_PARA_LONG", words=word_count))
+    else:
+        score += 5
+        issues.append(issue("FIRST_PARA_TOO_LONG", words=word_count))
+
+    # Check for definition pattern ("X is/是...")
+    has_definition = bool(DEFINITION_PATTERN.search(first_para))
+    if has_definition:
+        score += 5
+    else:
+        suggestions.append(issue("NO_DEFINITION"))
+
+    return score, issues, suggestions
+
+
+def audit_heading_structure(doc: Document) -> tuple[int, list[dict], list[dict], dict]:
+    """Check heading hierarchy and structure."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    h1_matches = [h.text for h in doc.headings_at(1)]
+    h2_matches = [h.text for h in doc.headings_at(2)]
+    h3_matches = [h.text for h in doc.headings_at(3)]
+
+    details = {
+        "h1_count": len(h1_matches),
+        "h2_count": len(h2_matches),
+        "h3_count": len(h3_matches),
+        "h2_titles": h2_matches[:5],  # First 5 for reference
+    }
+
+    # H1 check
+    if len(h1_matches) == 1:
+        score += 5
+    elif len(h1_matches) == 0:
+        issues.append(issue("H1_MISSING"))
+    else:
+        issues.append(issue("H1_MULTIPLE", count=len(h1_matches)))
+
+    # H2 check (ideal: 3-7)
+    if 3 <= len(h2_matches) <= 7:
+        score += 10
+    elif len(h2_matches) < 3:
+        score += 5
+        suggestions.append(issue("H2_TOO_FEW", count=len(h2_matches)))
+    else:
+        score += 8
+        suggestions.append(issue("H2_TOO_MANY", count=len(h2_matches)))
+
+    # Question-format H2s (good for FAQ/AEO)
+    question_h2s = [h for h in h2_matches if QUESTION_HEADING_PATTERN.search(h)]
+    if question_h2s:
+        score += 5
+        details["question_h2s"] = len(question_h2s)
+
+    return score, issues, suggestions, details
+
+
+def audit_lists_and_tables(doc: Document) -> tuple[int, list[dict], list[dict], dict]:
+    """Check for structured content elements."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    # Bullet/numbered lists
+    has_lists = len(doc.list_items) > 0
+
+    # Tables
+    has_tables = len(doc.table_rows) > 2  # At least header + separator + 1 row
+
+    details = {
+        "list_items": len(doc.list_items),
+        "has_tables": has_tables,
+        "table_rows": len(doc.table_rows),
+        "code_blocks": len(doc.code_fences),
+    }
+
+    if has_lists:
+        score += 5
+    else:
+        suggestions.append(issue("NO_LISTS"))
+
+    if has_tables:
+        score += 5
+    else:
+        suggestions.append(issue("NO_TABLES"))
+
+    return score, issues, suggestions, details
+
+
+def audit_brand_binding(doc: Document, brand: Optional[str] = None) -> tuple[int, list[dict], list[dict], dict]:
+    """Check for brand entity binding."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    # Mentions per dictionary brand, plus the audited brand even when absent
+    details = {name: count for name, count in doc.hits.brands.items() if count or name == brand}
+
+    if not brand:
+        return score, issues, suggestions, details
+
+    # Count brand mentions (name and aliases)
+    mentions = doc.hits.brands.get(brand, 0)
+
+    if mentions >= 3:
+        score += 10
+    elif mentions >= 1:
+        score += 5
+        suggestions.append(issue("BRAND_WEAK", brand=brand, count=mentions))
+    else:
+        issues.append(issue("BRAND_MISSING", brand=brand))
+
+    return score, issues, suggestions, details
+
+
+def audit_cta(doc: Document) -> tuple[int, list[dict], list[dict]]:
+    """Check for appropriate CTAs."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    # Low-friction CTA phrases from the dictionary
+    has_cta = doc.hits.categories.get("cta", 0) > 0
+
+    if has_cta:
+        score += 5
+    else:
+        suggestions.append(issue("NO_CTA"))
+
+    return score, issues, suggestions
+
+
+def audit_internal_links(doc: Document) -> tuple[int, list[dict], list[dict], dict]:
+    """Check internal linking."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    # Markdown links
+    internal_links = [l for l in doc.links if not l.target.startswith(('http://', 'https://', 'mailto:'))]
+    external_links = [l for l in doc.links if l.target.startswith(('http://', 'https://'))]
+
+    details = {
+        "internal_links": len(internal_links),
+        "external_links": len(external_links),
+    }
+
+    # Internal links (ideal: 3-5)
+    if len(internal_links) >= 3:
+        score += 5
+    elif len(internal_links) >= 1:
+        score += 3
+        suggestions.append(issue("INTERNAL_LINKS_FEW", count=len(internal_links)))
+    else:
+        suggestions.append(issue("INTERNAL_LINKS_MISSING"))
+
+    return score, issues, suggestions, details
+
+
+def audit_eeat_signals(doc: Document) -> tuple[int, list[dict], list[dict], dict]:
+    """Check for E-E-A-T signals."""
+    score = 0
+    issues = []
+    suggestions = []
+
+    # Experience signals ("我们发现", "In our experience", etc.)
+    has_experience = doc.hits.categories.get("experience", 0) > 0
+
+    # Data/statistics
+    has_data = doc.has_data
+
+    # Citations/sources
+    has_citations = doc.hits.categories.get("citation", 0) > 0
+
+    if has_experience:
+        score += 5
+    else:
+        suggestions.append(issue("NO_EXPERIENCE"))
+
+    if has_data:
+        score += 5
+    else:
+        suggestions.append(issue("NO_DATA"))
+
+    if has_citations:
+        score += 5
+    else:
+        suggestions.append(issue("NO_CITATIONS"))
+
+    # Dictionary phrase counts per category
+    details = dict(doc.hits.categories)
+
+    return score, issues, suggestions, details
+
+
+# Numeric features behind every score, in feature-vector order
+FEATURES = (
+    "words", "han_chars", "kana_chars", "hangul_chars", "latin_words", "digit_words",
+    "first_paragraph_words", "has_definition",
+    "h1_count", "h2_count", "h3_count", "question_h2s",
+    "list_items", "table_rows", "code_blocks",
+    "internal_links", "external_links", "brand_mentions",
+    "cta_phrases", "experience_phrases", "citation_phrases", "has_data",
+    "inbound_links", "broken_links",
+)
+
+
+def extract_features(doc: Document, brand: Optional[str] = None) -> tuple[int, list[dict], list[dict], dict]:
+    """Collect the document's feature vector for re-scoring (scores no points)."""
+    categories = doc.hits.categories
+    links = [l.target for l in doc.links]
+    internal = sum(not t.startswith(('http://', 'https://', 'mailto:')) for t in links)
+    external = sum(t.startswith(('http://', 'https://')) for t in links)
+    words = doc.script_counts
+    values = (
+        words.words, words.han, words.kana, words.hangul, words.latin, words.digits,
+        count_words(doc.first_paragraph),
+        bool(DEFINITION_PATTERN.search(doc.first_paragraph)),
+        len(doc.headings_at(1)),
+        len(doc.headings_at(2)),
+        len(doc.headings_at(3)),
+        sum(bool(QUESTION_HEADING_PATTERN.search(h.text)) for h in doc.headings_at(2)),
+        len(doc.list_items),
+        len(doc.table_rows),
+        len(doc.code_fences),
+        internal,
+        external,
+        doc.hits.brands.get(brand, 0) if brand else 0,
+        categories.get("cta", 0),
+        categories.get("experience", 0),
+        categories.get("citation", 0),
+        doc.has_data,
+        0,      # inbound_links and broken_links need the corpus link graph,
+        0,      # filled in by apply_link_graph()
+    )
+    return 0, [], [], dict(zip(FEATURES, map(int, values)))
+
+
+# What auditors read from a document, each computed only if a selected
+# auditor needs it: "structure" is the line parse (headings, paragraphs,
+# lists, tables, code fences, frontmatter), "links" adds link extraction to
+# it, "lexicon" the dictionary scan, "scripts" the per-script word counts
+# and "data" the numeric-signal search.
+ARTIFACTS = frozenset({"structure", "links", "lexicon", "scripts", "data"})
+
+# Entry point group third-party auditors register under; each entry point
+# loads an Auditor, e.g. ``readability = "my_checks:READABILITY"``
+AUDITOR_ENTRY_POINTS = "geo_audit.auditors"
+
+
+@dataclass(frozen=True)
+class Auditor:
+    """One scored check run by :func:`audit_document`.
+
+    ``uses`` names the inputs besides the parsed document: ``"brand"`` (the
+    audited brand and the dictionary's brands) and ``"phrases"`` (the
+    dictionary's phrase categories). Both also key the audit cache.
+    ``needs`` names the :data:`ARTIFACTS` the check reads (all of them
+    unless declared), ``points`` its maximum score and ``cost`` its rough
+    relative run time, artifacts included. ``codes`` lists the issue and
+    suggestion codes it can report, the columns of a :class:`ReportTable`.
+    """
+    name: str
+    func: Callable
+    details_key: Optional[str] = None
+    uses: frozenset = frozenset()
+    needs: frozenset = ARTIFACTS
+    points: int = 0
+    cost: int = 1
+    codes: tuple[str, ...] = ()
+
+    def run(self, doc: Document, brand: Optional[str]) -> list:
+        """Run the check and return ``[score, issues, suggestions, details]``."""
+        result = self.func(doc, brand) if "brand" in self.uses else self.func(doc)
+        return [*result, None][:4]
+
+
+AUDITORS = (
+    Auditor("direct_answer", audit_direct_answer,
+            needs=frozenset({"structure"}), points=20, cost=1,
+            codes=("FIRST_PARA_LONG", "FIRST_PARA_TOO_LONG", "NO_DEFINITION")),
+    Auditor("headings", audit_heading_structure, "structure",
+            needs=frozenset({"structure"}), points=20, cost=1,
+            codes=("H1_MISSING", "H1_MULTIPLE", "H2_TOO_FEW", "H2_TOO_MANY")),
+    Auditor("elements", audit_lists_and_tables, "elements",
+            needs=frozenset({"structure"}), points=10, cost=1,
+            codes=("NO_LISTS", "NO_TABLES")),
+    Auditor("brand", audit_brand_binding, "brands", frozenset({"brand"}),
+            needs=frozenset({"lexicon"}), points=10, cost=3,
+            codes=("BRAND_WEAK", "BRAND_MISSING")),
+    Auditor("cta", audit_cta, uses=frozenset({"phrases"}),
+            needs=frozenset({"lexicon"}), points=5, cost=3,
+            codes=("NO_CTA",)),
+    Auditor("links", audit_internal_links, "links",
+            needs=frozenset({"links"}), points=5, cost=2,
+            codes=("INTERNAL_LINKS_FEW", "INTERNAL_LINKS_MISSING")),
+    Auditor("eeat", audit_eeat_signals, "signals", frozenset({"phrases"}),
+            needs=frozenset({"lexicon", "data"}), points=15, cost=4,
+            codes=("NO_EXPERIENCE", "NO_DATA", "NO_CITATIONS")),
+    Auditor("features", extract_features, "features", frozenset({"brand", "phrases"}),
+            needs=frozenset({"links", "lexicon", "scripts", "data"}), cost=6),
+)
+
+# Raw points that score 100 when every built-in auditor runs (of 85 available)
+SCORE_NORMALIZE = 75
+BUILTIN_POINTS = sum(a.points for a in AUDITORS)
+
+
+def find_entry_points(group: str) -> list[tuple[str, str]]:
+    """``(name, "module:attr")`` entry points in ``group`` of the installed distributions.
+
+    Reads the ``entry_points.txt`` of each ``*.dist-info`` / ``*.egg-info``
+    on ``sys.path`` directly, the first distribution of a name winning, as
+    importlib.metadata does; importing that costs more than a whole
+    single-file audit.
+    """
+    found = []
+    seen = set()
+    for directory in sys.path:
+        try:
+            names = os.listdir(directory or ".")
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith((".dist-info", ".egg-info")):
+                continue
+            distribution = name.partition("-")[0].lower().replace(".", "_")
+            if distribution in seen:
+                continue
+            seen.add(distribution)
+            try:
+                with open(os.path.join(directory or ".", name, "entry_points.txt"), encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            section = None
+            for line in map(str.strip, lines):
+                if line.startswith("["):
+                    section = line.strip("[]").strip()
+                elif section == group and "=" in line and not line.startswith(("#", ";")):
+                    key, value = line.split("=", 1)
+                    found.append((key.strip(), value.split("[", 1)[0].strip()))
+    return found
+
+
+def load_entry_point(value: str):
+    """Import the object a ``"module:attr"`` entry point names."""
+    import importlib
+
+    module, _, attrs = value.partition(":")
+    obj = importlib.import_module(module.strip())
+    for attr in filter(None, attrs.strip().split(".")):
+        obj = getattr(obj, attr)
+    return obj
+
+
+@lru_cache(maxsize=None)
+def registered_auditors() -> tuple[Auditor, ...]:
+    """The built-in auditors plus any registered under :data:`AUDITOR_ENTRY_POINTS`."""
+    auditors = list(AUDITORS)
+    names = {a.name for a in auditors}
+    for entry, value in find_entry_points(AUDITOR_ENTRY_POINTS):
+        try:
+            auditor = load_entry_point(value)
+        except Exception as e:
+            print(f"Warning: cannot load auditor '{entry}': {e}", file=sys.stderr)
+            continue
+        if not isinstance(auditor, Auditor) or auditor.name in names:
+            print(f"Warning: ignoring auditor entry point '{entry}': "
+                  "not an Auditor, or its name is taken", file=sys.stderr)
+            continue
+        auditors.append(auditor)
+        names.add(auditor.name)
+    return tuple(auditors)
+
+
+@lru_cache(maxsize=None)
+def select_auditors(checks: Optional[tuple[str, ...]] = None, skip: tuple[str, ...] = ()) -> tuple[Auditor, ...]:
+    """Registered auditors named in ``checks`` (all if ``None``) minus ``skip``.
+
+    Raises :class:`ValueError` on a name no registered auditor has.
+    """
+    auditors = registered_auditors()
+    known = [a.name for a in auditors]
+    unknown = [name for name in (*(checks or ()), *skip) if name not in known]
+    if unknown:
+        raise ValueError(f"unknown check(s): {', '.join(unknown)} (available: {', '.join(known)})")
+    return tuple(a for a in auditors if (checks is None or a.name in checks) and a.name not in skip)
+
+# Parsing helpers whose code is folded into every auditor's cache version
+PARSER_FUNCTIONS = (
+    parse_document, _heading_level, _is_list_item, _is_table_row, _iter_links,
+    _fence_marker, segment, count_words, Document.script_counts.func, Document.has_data.func,
+)
+
+
+def _code_digest(code, h) -> None:
+    """Feed a code object's bytecode, names and constants into hash ``h``."""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_digest(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+@lru_cache(maxsize=None)
+def auditor_version(auditor: Auditor) -> str:
+    """Version stamp of an auditor: a digest of its code and the parser's.
+
+    Editing the logic or weights of one ``audit_*`` function changes only
+    that auditor's stamp, so only its cache entries go stale.
+    """
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr(sys.version_info[:2]).encode())
+    for func in (auditor.func, *PARSER_FUNCTIONS):
+        _code_digest(func.__code__, h)
+    h.update(repr((DATA_PATTERNS, DEFINITION_PATTERN, QUESTION_HEADING_PATTERN,
+                   SEGMENT_PATTERN, SEGMENT_SOURCE_BYTES)).encode())
+    return h.hexdigest()
+
+
+def auditor_variant(auditor: Auditor, brand: Optional[str], lexicon: Lexicon) -> str:
+    """Cache variant of an auditor's inputs beyond the document itself."""
+    parts = []
+    if "brand" in auditor.uses:
+        parts += [brand or "", lexicon.brand_stamp]
+    if "phrases" in auditor.uses:
+        parts.append(lexicon.phrase_stamp)
+    return "|".join(parts)
+
+
+def run_auditors(
+    doc: Document,
+    brand: Optional[str],
+    lexicon: Lexicon,
+    auditors: Optional[Iterable[Auditor]] = None,
+    timings: Optional["AuditTimings"] = None,
+) -> dict[str, list]:
+    """Run auditors (default: all registered) on a document, scanning the
+    dictionary only if one of them needs it.
+
+    With ``timings``, the scan and each auditor are timed into it.
+    """
+    outcomes = {}
+    clock = time.perf_counter
+    for auditor in registered_auditors() if auditors is None else auditors:
+        if "lexicon" in auditor.needs and doc.hits is None:
+            started = clock()
+            doc.hits = lexicon.scan(doc.lower_text, doc.deadline)
+            if timings is not None:
+                timings.scan = clock() - started
+        started = clock()
+        outcomes[auditor.name] = auditor.run(doc, brand)
+        if timings is not None:
+            timings.auditors[auditor.func.__name__] = clock() - started
+    return outcomes
+
+
+# Scoring rules over FEATURES. Each feature maps to [upper, points] bands:
+# the first band whose upper bound (inclusive; null = unbounded) covers the
+# value awards its points. The totals are normalized by ``normalize`` to 100.
+# These defaults reproduce the built-in audit_* scoring.
+DEFAULT_WEIGHTS = {
+    "rules": {
+        "first_paragraph_words": [[60, 15], [100, 10], [None, 5]],
+        "has_definition": [[0, 0], [None, 5]],
+        "h1_count": [[0, 0], [1, 5], [None, 0]],
+        "h2_count": [[2, 5], [7, 10], [None, 8]],
+        "question_h2s": [[0, 0], [None, 5]],
+        "list_items": [[0, 0], [None, 5]],
+        "table_rows": [[2, 0], [None, 5]],
+        "brand_mentions": [[0, 0], [2, 5], [None, 10]],
+        "cta_phrases": [[0, 0], [None, 5]],
+        "internal_links": [[0, 0], [2, 3], [None, 5]],
+        "experience_phrases": [[0, 0], [None, 5]],
+        "has_data": [[0, 0], [None, 5]],
+        "citation_phrases": [[0, 0], [None, 5]],
+    },
+    "normalize": 75,
+    "pass_score": 70,
+}
+
+
+def load_weights(path: Optional[str] = None) -> dict:
+    """Load a weights config over the defaults (a feature's rules replace its defaults)."""
+    weights = {**DEFAULT_WEIGHTS, "rules": dict(DEFAULT_WEIGHTS["rules"])}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        weights["rules"].update(data.get("rules", {}))
+        for key in ("normalize", "pass_score"):
+            if key in data:
+                weights[key] = data[key]
+    return weights
+
+
+class Scorer:
+    """A weights config compiled for scoring single documents or whole corpora."""
+
+    def __init__(self, weights: dict):
+        self.weights = weights
+        self.normalize = float(weights["normalize"])
+        self.pass_score = weights["pass_score"]
+        if self.normalize <= 0:
+            raise ValueError("weights: normalize must be positive")
+        self.rules = []     # (feature, upper bounds, points per band)
+        for feature, bands in weights["rules"].items():
+            if feature not in FEATURES:
+                raise ValueError(f"weights: unknown feature {feature!r}")
+            uppers = [float("inf") if upper is None else float(upper) for upper, _ in bands]
+            if not bands or uppers != sorted(uppers):
+                raise ValueError(f"weights: bands for {feature!r} must be ascending")
+            if uppers[-1] != float("inf"):
+                uppers.append(float("inf"))
+                bands = [*bands, [None, 0]]
+            self.rules.append((feature, uppers, [points for _, points in bands]))
+
+    def _normalized(self, total: float) -> int:
+        return min(100, int(total * 100 / self.normalize))
+
+    def score(self, features: dict) -> tuple[int, bool]:
+        """Score one feature dict; returns ``(score, passed)``."""
+        total = 0
+        for feature, uppers, points in self.rules:
+            total += points[bisect_left(uppers, features.get(feature, 0))]
+        score = self._normalized(total)
+        return score, score >= self.pass_score
+
+    def score_matrix(self, matrix, names: Iterable[str], rows: int) -> tuple[list[int], list[bool]]:
+        """Score a row-major float32 feature matrix, one rule at a time.
+
+        ``matrix`` is any buffer of ``rows * len(names)`` floats. Uses numpy
+        when it is installed and plain column slices otherwise.
+        """
+        columns = {name: i for i, name in enumerate(names)}
+        width = len(columns)
+        missing = [f for f, _, _ in self.rules if f not in columns]
+        if missing:
+            raise ValueError(f"feature store lacks {', '.join(missing)}")
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if np is not None:
+            values = np.frombuffer(matrix, dtype="<f4", count=rows * width).reshape(rows, width)
+            total = np.zeros(rows)
+            for feature, uppers, points in self.rules:
+                bands = np.searchsorted(np.array(uppers), values[:, columns[feature]], side="left")
+                total += np.array(points, dtype=float)[bands]
+            scores = np.minimum(100, (total * 100 / self.normalize).astype(np.int64))
+            return scores.tolist(), (scores >= self.pass_score).tolist()
+
+        from array import array
+        from operator import add
+
+        values = array("f")
+        values.frombytes(bytes(matrix)[:rows * width * 4])
+        if sys.byteorder == "big":
+            values.byteswap()
+        total = [0] * rows
+        for feature, uppers, points in self.rules:
+            column = values[columns[feature]::width]
+            total = list(map(add, total, [points[bisect_left(uppers, v)] for v in column]))
+        scores = [self._normalized(t) for t in total]
+        return scores, [s >= self.pass_score for s in scores]
+
+
+@lru_cache(maxsize=16)
+def get_scorer(weights_path: Optional[str] = None) -> Scorer:
+    return Scorer(load_weights(weights_path))
+
+
+def build_result(
+    outcomes: dict[str, list],
+    scorer: Optional[Scorer] = None,
+    auditors: Optional[Iterable[Auditor]] = None,
+) -> AuditResult:
+    """Combine per-auditor outcomes into a normalized :class:`AuditResult`.
+
+    ``auditors`` (default: all registered) are the ones that ran; the score
+    is normalized over the points they can award.
+    """
+    auditors = registered_auditors() if auditors is None else tuple(auditors)
+    total_score = 0
+    max_score = 100
+    all_issues = []
+    all_suggestions = []
+    all_details = {}
+
+    for auditor in auditors:
+        score, issues, suggestions, details = outcomes[auditor.name]
+        total_score += score
+        all_issues.extend(issues)
+        all_suggestions.extend(suggestions)
+        if auditor.details_key and details is not None:
+            all_details[auditor.details_key] = details
+
+    # Normalize to 100: the full built-in set needs SCORE_NORMALIZE points,
+    # a selection its share of them
+    points = sum(a.points for a in auditors)
+    if points:
+        normalized_score = min(100, int(total_score * 100 / (SCORE_NORMALIZE * points / BUILTIN_POINTS)))
+    else:
+        normalized_score = 100      # nothing scored, nothing failed
+    passed = normalized_score >= 70
+    if scorer is not None and "features" in all_details:
+        normalized_score, passed = scorer.score(all_details["features"])
+
+    return AuditResult(
+        passed=passed,
+        score=normalized_score,
+        max_score=max_score,
+        issues=all_issues,
+        suggestions=all_suggestions,
+        details=all_details,
+    )
+
+
+@dataclass
+class AuditTimings:
+    """Where one audit spent its time, reported as ``details["timings"]``."""
+    parse: float = 0.0
+    scan: float = 0.0
+    auditors: dict[str, float] = field(default_factory=dict)
+    score: float = 0.0
+    total: float = 0.0
+    cached: list[str] = field(default_factory=list)
+
+    def report(self, size: int, doc: Optional[Document]) -> dict:
+        def ms(seconds):
+            return round(seconds * 1000, 3)
+
+        report = {
+            "bytes": size,
+            "total_ms": ms(self.total),
+            "parse_ms": ms(self.parse + self.scan),
+            "scoring_ms": ms(sum(self.auditors.values()) + self.score),
+            "lexicon_scan_ms": ms(self.scan),
+            "auditors_ms": {name: ms(t) for name, t in self.auditors.items()},
+            "cached": self.cached,
+        }
+        if doc is not None:
+            hits = doc.hits or LexiconHits()
+            report["matches"] = {
+                "headings": sum(map(len, doc.headings.values())),
+                "paragraphs": len(doc.paragraphs),
+                "list_items": len(doc.list_items),
+                "table_rows": len(doc.table_rows),
+                "code_fences": len(doc.code_fences),
+                "links": len(doc.links),
+                "phrases": sum(hits.categories.values()),
+                "brands": sum(hits.brands.values()),
+            }
+        return report
+
+
+def _resolve(brand: Optional[str], lexicon: Optional[Lexicon]) -> tuple[Optional[str], Lexicon]:
+    if lexicon is None:
+        lexicon = get_lexicon(brand=brand)
+    if brand:
+        brand = lexicon.canonical_brand(brand) or brand
+    return brand, lexicon
+
+
+def audit_content(
+    content: str,
+    brand: Optional[str] = None,
+    time_budget: Optional[float] = None,
+    lexicon: Optional[Lexicon] = None,
+    cache: Optional["AuditCache"] = None,
+    scorer: Optional[Scorer] = None,
+    profile: bool = False,
+    auditors: Optional[Iterable[Auditor]] = None,
+) -> AuditResult:
+    """Run full GEO audit on content.
+
+    With ``time_budget`` (seconds), an audit that runs over budget returns a
+    failed result flagged ``details["timeout"]`` instead of blocking.
+    ``lexicon`` defaults to the built-in dictionary plus ``brand``. With a
+    ``cache``, auditors whose stored result is still current are skipped, and
+    a fully cached document is not parsed at all. A ``scorer`` replaces the
+    built-in score with one computed from the feature vector. ``profile``
+    adds ``details["timings"]``: time per stage and auditor, bytes scanned
+    and match counts. ``auditors`` (default: all registered, see
+    :func:`select_auditors`) limits the checks, and the parsing done for them.
+    """
+    def parse(deadline, lexicon, missing, timings):
+        needs = frozenset().union(*(a.needs for a in missing))
+        if not needs & {"structure", "links"}:
+            return Document(text=content, deadline=deadline)
+        return parse_document(content, deadline, links="links" in needs)
+
+    return _audit(
+        lambda: AuditCache.content_hash(content),
+        parse,
+        lambda: len(content.encode("utf-8")),
+        brand, time_budget, lexicon, cache, scorer, profile, auditors,
+    )
+
+
+def _audit(
+    content_hash: Callable[[], str],
+    parse: Callable[..., Document],
+    size: Callable[[], int],
+    brand: Optional[str],
+    time_budget: Optional[float],
+    lexicon: Optional[Lexicon],
+    cache: Optional["AuditCache"],
+    scorer: Optional[Scorer],
+    profile: bool,
+    auditors: Optional[Iterable[Auditor]],
+) -> AuditResult:
+    """The audit behind :func:`audit_content` and :func:`audit_chunked`.
+
+    ``parse(deadline, lexicon, missing, timings)`` returns the document the
+    ``missing`` auditors run on; it is not called if the cache has them all.
+    """
+    brand, lexicon = _resolve(brand, lexicon)
+    auditors = registered_auditors() if auditors is None else tuple(auditors)
+    clock = time.perf_counter
+    started = clock()
+    deadline = started + time_budget if time_budget else None
+    timings = AuditTimings() if profile else None
+    doc = None
+    try:
+        if cache is None:
+            missing = auditors
+            outcomes = {}
+        else:
+            digest = content_hash()
+            keys = {
+                a.name: (auditor_version(a), auditor_variant(a, brand, lexicon)) for a in auditors
+            }
+            outcomes = cache.get(digest, keys)
+            missing = [a for a in auditors if a.name not in outcomes]
+        if missing:
+            doc = parse(deadline, lexicon, missing, timings)
+            if timings is not None:
+                timings.parse = clock() - started - timings.scan
+            fresh = run_auditors(doc, brand, lexicon, missing, timings)
+            if cache is not None:
+                cache.put(digest, {name: (*keys[name], fresh[name]) for name in fresh})
+            outcomes.update(fresh)
+        if timings is None:
+            return build_result(outcomes, scorer, auditors)
+
+        scored = clock()
+        result = build_result(outcomes, scorer, auditors)
+        timings.score = clock() - scored
+        timings.total = clock() - started
+        timings.cached = [a.name for a in auditors if a not in missing]
+        result.details["timings"] = timings.report(size(), doc)
+        return result
+    except AuditTimeout:
+        return AuditResult(
+            passed=False,
+            score=0,
+            max_score=100,
+            issues=[issue("AUDIT_TIMEOUT", seconds=time_budget)],
+            suggestions=[],
+            details={"timeout": True, "time_budget": time_budget},
+        )
+
+
+def audit_document(
+    doc: Document,
+    brand: Optional[str] = None,
+    lexicon: Optional[Lexicon] = None,
+    scorer: Optional[Scorer] = None,
+) -> AuditResult:
+    """Run full GEO audit on a parsed document."""
+    brand, lexicon = _resolve(brand, lexicon)
+    return build_result(run_auditors(doc, brand, lexicon), scorer)
+
+
+@dataclass(frozen=True)
+class Section:
+    """A stretch of a document from one H2 heading up to the next.
+
+    ``doc`` is the parse of the section text alone (section-local offsets).
+    Sections start outside code fences and no signal spans a line, so
+    per-section parses and dictionary hits add up to the whole document's.
+    """
+    start: int
+    doc: Document
+    hits: LexiconHits
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.doc.text)
+
+
+def _between(items: list, lo: int, hi: int, key=None) -> list:
+    """The run of offset-sorted ``items`` whose offset lies in ``[lo, hi)``."""
+    return items[bisect_left(items, lo, key=key):bisect_left(items, hi, key=key)]
+
+
+def _offset(item) -> int:
+    return item.offset
+
+
+def _first(item) -> int:
+    return item[0]
+
+
+def _slice(doc: Document, lo: int, hi: int) -> Document:
+    """The part of ``doc`` in ``[lo, hi)`` as a document of its own."""
+    part = Document(text=doc.text[lo:hi])
+    for level, headings in doc.headings.items():
+        moved = [Heading(h.level, h.text, h.offset - lo) for h in _between(headings, lo, hi, _offset)]
+        if moved:
+            part.headings[level] = moved
+    part.paragraphs = [(a - lo, b - lo) for a, b in _between(doc.paragraphs, lo, hi, _first)]
+    part.list_items = [o - lo for o in _between(doc.list_items, lo, hi)]
+    part.table_rows = [o - lo for o in _between(doc.table_rows, lo, hi)]
+    part.code_fences = [(a - lo, b - lo, i) for a, b, i in _between(doc.code_fences, lo, hi, _first)]
+    part.links = [Link(l.text, l.target, l.offset - lo) for l in _between(doc.links, lo, hi, _offset)]
+    if part.paragraphs:
+        a, b = part.paragraphs[0]
+        part.first_paragraph = part.text[a:b].strip()
+    return part
+
+
+def parse_sections(text: str, base: int, lexicon: Lexicon) -> tuple[list[Section], bool]:
+    """Parse ``text``, found at offset ``base`` of its document, into sections.
+
+    Also returns whether the text ended inside a code fence or frontmatter,
+    in which case it would swallow whatever follows it.
+    """
+    doc = parse_document(text, frontmatter=base == 0)
+    cuts = [0, *(h.offset for h in doc.headings_at(2) if h.offset), len(text)]
+    sections = []
+    for lo, hi in zip(cuts, cuts[1:]):
+        part = _slice(doc, lo, hi)
+        if lo == 0:
+            part.frontmatter = doc.frontmatter
+        sections.append(Section(base + lo, part, lexicon.scan(part.lower_text)))
+    return sections, doc.unclosed
+
+
+def _add_hits(total: LexiconHits, hits: LexiconHits):
+    """Add one stretch's dictionary hits into ``total``."""
+    for name, count in hits.categories.items():
+        total.categories[name] = total.categories.get(name, 0) + count
+    for name, count in hits.brands.items():
+        total.brands[name] = total.brands.get(name, 0) + count
+
+
+def merge_sections(text: str, sections: list[Section]) -> Document:
+    """Assemble the whole-document view auditors read from section parses."""
+    doc = Document(text=text, frontmatter=sections[0].doc.frontmatter if sections else {})
+    hits = LexiconHits()
+    for section in sections:
+        part, at = section.doc, section.start
+        for level, headings in part.headings.items():
+            doc.headings.setdefault(level, []).extend(
+                Heading(h.level, h.text, h.offset + at) for h in headings)
+        doc.paragraphs += [(a + at, b + at) for a, b in part.paragraphs]
+        doc.list_items += [o + at for o in part.list_items]
+        doc.table_rows += [o + at for o in part.table_rows]
+        doc.code_fences += [(a + at, b + at, i) for a, b, i in part.code_fences]
+        doc.links += [Link(l.text, l.target, l.offset + at) for l in part.links]
+        if not doc.first_paragraph:
+            doc.first_paragraph = part.first_paragraph
+        _add_hits(hits, section.hits)
+    doc.hits = hits
+    doc.has_data = any(section.doc.has_data for section in sections)
+    return doc
+
+
+@dataclass
+class AuditState:
+    """Section-level audit state for incremental re-audits while editing.
+
+    ``AuditState.start(content)`` audits a draft once; each :meth:`edit`
+    re-parses only the sections the edit touches and returns the new state,
+    whose ``result`` equals a full :func:`audit_content` of the new text.
+    """
+    text: str
+    brand: Optional[str]
+    lexicon: Lexicon
+    sections: list[Section]
+    result: AuditResult
+
+    @classmethod
+    def start(
+        cls,
+        content: str,
+        brand: Optional[str] = None,
+        lexicon: Optional[Lexicon] = None,
+    ) -> "AuditState":
+        brand, lexicon = _resolve(brand, lexicon)
+        sections, _ = parse_sections(content, 0, lexicon)
+        return cls._build(content, brand, lexicon, sections)
+
+    @classmethod
+    def _build(cls, text, brand, lexicon, sections) -> "AuditState":
+        doc = merge_sections(text, sections)
+        return cls(text, brand, lexicon, sections, build_result(run_auditors(doc, brand, lexicon)))
+
+    def edit(self, start: int, end: int, replacement: str) -> "AuditState":
+        """Replace ``text[start:end]`` with ``replacement`` and re-audit."""
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"edit range {start}:{end} outside 0:{len(self.text)}")
+        text = self.text[:start] + replacement + self.text[end:]
+        delta = len(replacement) - (end - start)
+        sections = self.sections
+
+        # Sections touching the edit, plus the one before: an edit to a
+        # heading line can merge its section into the previous one.
+        touched = [i for i, s in enumerate(sections) if s.start <= end and start <= s.end]
+        first = max(0, touched[0] - 1) if touched else 0
+        last = touched[-1] if touched else len(sections) - 1
+        while True:
+            lo = sections[first].start
+            hi = sections[last].end + delta
+            fresh, unclosed = parse_sections(text[lo:hi], lo, self.lexicon)
+            # An open fence or frontmatter swallows the following sections too
+            if not unclosed or last == len(sections) - 1:
+                break
+            last += 1
+
+        tail = [replace(s, start=s.start + delta) for s in sections[last + 1:]]
+        return self._build(text, self.brand, self.lexicon, sections[:first] + fresh + tail)
+
+
+STREAM_ABOVE = 64 << 20         # bytes; larger files are audited in chunks
+STREAM_CHUNK_SIZE = 1 << 20     # characters per chunk
+
+
+def read_chunks(path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[tuple[str, bool]]:
+    """Yield a UTF-8 file's text as ``(chunk, final)`` pieces of about
+    ``chunk_size`` characters.
+
+    Every piece but the final one ends with a newline (a longer line makes
+    a longer piece). Newlines are translated as by ``Path.read_text``.
+    """
+    with open(path, encoding="utf-8") as f:
+        rest: list[str] = []
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            cut = block.rfind('\n') + 1
+            if not cut:
+                rest.append(block)
+                continue
+            rest.append(block[:cut])
+            yield "".join(rest), False
+            rest = [block[cut:]]
+        yield "".join(rest), True
+
+
+class LinkIndex(Sequence):
+    """Links held as offsets and interned target ids in compact arrays.
+
+    Items are rebuilt as :class:`Link` objects on access, without their text.
+    """
+
+    def __init__(self):
+        from array import array
+
+        self._ids: dict[str, int] = {}
+        self._targets: list[str] = []
+        self._target_ids = array("I")
+        self._offsets = array("q")
+
+    def append(self, target: str, offset: int):
+        target_id = self._ids.get(target)
+        if target_id is None:
+            target_id = self._ids[target] = len(self._targets)
+            self._targets.append(target)
+        self._target_ids.append(target_id)
+        self._offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Link("", self._targets[self._target_ids[index]], self._offsets[index])
+
+    def __iter__(self) -> Iterator[Link]:
+        targets = self._targets
+        for target_id, offset in zip(self._target_ids, self._offsets):
+            yield Link("", targets[target_id], offset)
+
+
+def parse_stream(
+    chunks: Iterable[tuple[str, bool]],
+    lexicon: Lexicon,
+    deadline: Optional[float] = None,
+    missing: Iterable[Auditor] = AUDITORS,
+    timings: Optional[AuditTimings] = None,
+) -> Document:
+    """Parse a document from :func:`read_chunks` pieces, one at a time.
+
+    Returns the whole-document view the ``missing`` auditors read, with
+    dictionary hits, script counts and data signals summed over chunks:
+    no signal spans a line, so the sums equal the whole text's. Only what
+    auditors read is kept: offsets go into compact arrays, paragraphs keep
+    their start offsets and links their targets (see :class:`LinkIndex`).
+    """
+    from array import array
+
+    needs = frozenset().union(*(a.needs for a in missing))
+    scan = "lexicon" in needs
+    count_scripts = "scripts" in needs
+    find_data = "data" in needs
+    clock = time.perf_counter
+    doc = Document(text="", deadline=deadline)
+    doc.paragraphs, doc.list_items, doc.table_rows = array("q"), array("q"), array("q")
+    hits = LexiconHits()
+    counts = ScriptCounts()
+    has_data = False
+    doc.links = LinkIndex()
+    state = None
+    at = 0
+    for text, final in chunks:
+        part = parse_document(text, deadline, state=state, final=final, links="links" in needs)
+        state = part.state
+        doc.frontmatter.update(part.frontmatter)
+        for level, headings in part.headings.items():
+            doc.headings.setdefault(level, []).extend(
+                Heading(h.level, h.text, h.offset + at) for h in headings)
+        doc.paragraphs.extend(a + at for a, _ in part.paragraphs)
+        doc.list_items.extend(o + at for o in part.list_items)
+        doc.table_rows.extend(o + at for o in part.table_rows)
+        doc.code_fences += [(a + at, b + at, i) for a, b, i in part.code_fences]
+        for link in part.links:
+            doc.links.append(link.target, link.offset + at)
+        if not doc.first_paragraph:
+            doc.first_paragraph = part.first_paragraph
+        doc.unclosed = part.unclosed
+        if scan:
+            started = clock()
+            _add_hits(hits, lexicon.scan(part.lower_text, deadline))
+            if timings is not None:
+                timings.scan += clock() - started
+        if count_scripts:
+            counts += part.script_counts
+        has_data = has_data or (find_data and part.has_data)
+        at += len(text)
+    doc.hits = hits if scan else None
+    doc.script_counts = counts
+    doc.has_data = has_data
+    return doc
+
+
+def audit_chunked(
+    path: str,
+    brand: Optional[str] = None,
+    time_budget: Optional[float] = None,
+    lexicon: Optional[Lexicon] = None,
+    cache: Optional["AuditCache"] = None,
+    scorer: Optional[Scorer] = None,
+    profile: bool = False,
+    auditors: Optional[Iterable[Auditor]] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AuditResult:
+    """Audit a markdown file read in chunks of ``chunk_size`` characters.
+
+    The result equals :func:`audit_content` of the file's text, while peak
+    memory follows the chunk size rather than the file size. With a
+    ``cache``, the file is read once more up front to hash it.
+    """
+    return _audit(
+        lambda: AuditCache.chunks_hash(text for text, _ in read_chunks(path, chunk_size)),
+        lambda deadline, lexicon, missing, timings: parse_stream(
+            read_chunks(path, chunk_size), lexicon, deadline, missing, timings),
+        lambda: os.path.getsize(path),
+        brand, time_budget, lexicon, cache, scorer, profile, auditors,
+    )
+
+
+def default_cache_dir() -> Path:
+    """``$GEO_AUDIT_CACHE_DIR``, else ``$XDG_CACHE_HOME/geo-audit`` or ``~/.cache/geo-audit``."""
+    if os.environ.get("GEO_AUDIT_CACHE_DIR"):
+        return Path(os.environ["GEO_AUDIT_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "geo-audit"
+
+
+class AuditCache:
+    """Persistent per-auditor results in SQLite, evicted least-recently-used.
+
+    Rows are keyed by content hash, auditor name, the auditor's version
+    stamp and its input variant (brand, dictionary). Stale versions are
+    never read again and age out through LRU eviction once the store grows
+    past ``max_bytes``.
+    """
+
+    FILENAME = "audit-cache.sqlite3"
+    EVICT_EVERY = 256   # writes between size checks
+
+    def __init__(self, directory: Path, max_bytes: int = 256 << 20):
+        import sqlite3
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / self.FILENAME
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._db = sqlite3.connect(str(self.path), timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " content_hash TEXT, auditor TEXT, version TEXT, variant TEXT,"
+            " payload TEXT, size INTEGER, last_used REAL,"
+            " PRIMARY KEY (content_hash, auditor, version, variant))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_lru ON results (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return AuditCache.chunks_hash((content,))
+
+    @staticmethod
+    def chunks_hash(chunks: Iterable[str]) -> str:
+        """:meth:`content_hash` of the concatenated chunks."""
+        import hashlib
+
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in chunks:
+            h.update(chunk.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, content_hash: str, keys: dict[str, tuple[str, str]]) -> dict[str, list]:
+        """Return stored outcomes for the auditors whose (version, variant) match."""
+        rows = self._db.execute(
+            "SELECT auditor, version, variant, payload FROM results WHERE content_hash = ?",
+            (content_hash,),
+        ).fetchall()
+        found = {
+            auditor: json.loads(payload)
+            for auditor, version, variant, payload in rows
+            if keys.get(auditor) == (version, variant)
+        }
+        if found:
+            self._db.executemany(
+                "UPDATE results SET last_used = ? WHERE content_hash = ? AND auditor = ?"
+                " AND version = ? AND variant = ?",
+                [(time.time(), content_hash, name, *keys[name]) for name in found],
+            )
+            self._db.commit()
+        return found
+
+    def put(self, content_hash: str, entries: dict[str, tuple[str, str, list]]):
+        """Store ``auditor → (version, variant, outcome)`` for one document."""
+        now = time.time()
+        rows = []
+        for auditor, (version, variant, outcome) in entries.items():
+            payload = json.dumps(outcome, ensure_ascii=False)
+            rows.append((content_hash, auditor, version, variant, payload, len(payload), now))
+        self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 1:
+            self.evict()
+
+    def evict(self):
+        """Drop least-recently-used rows until the store is under 90% of its bound."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 9 // 10
+        while total > target:
+            batch = self._db.execute(
+                "SELECT rowid, size FROM results ORDER BY last_used LIMIT 1000"
+            ).fetchall()
+            if not batch:
+                break
+            doomed = []
+            for rowid, size in batch:
+                doomed.append((rowid,))
+                total -= size
+                if total <= target:
+                    break
+            self._db.executemany("DELETE FROM results WHERE rowid = ?", doomed)
+        self._db.commit()
+
+
+@lru_cache(maxsize=4)
+def get_cache(directory: str, max_bytes: int) -> AuditCache:
+    """Open (once per process) the audit cache in ``directory``."""
+    return AuditCache(Path(directory), max_bytes)
+
+
+def print_report(result: AuditResult, verbose: bool = True, lang: str = DEFAULT_LANG):
+    """Print human-readable audit report."""
+    status = "✅ PASSED" if result.passed else "❌ NEEDS IMPROVEMENT"
+    print(f"\n{'='*50}")
+    print(f"GEO Content Audit Report")
+    print(f"{'='*50}")
+    print(f"\nScore: {result.score}/{result.max_score} {status}")
+
+    if result.issues:
+        print(f"\n🚨 Issues ({len(result.issues)}):")
+        for item in result.issues:
+            print(f"  • {render_issue(item, lang)}")
+
+    if result.suggestions and verbose:
+        print(f"\n💡 Suggestions ({len(result.suggestions)}):")
+        for item in result.suggestions:
+            print(f"  • {render_issue(item, lang)}")
+
+    if verbose and result.details:
+        print(f"\n📊 Details:")
+        if "structure" in result.details:
+            s = result.details["structure"]
+            print(f"  • H1: {s['h1_count']}, H2: {s['h2_count']}, H3: {s['h3_count']}")
+        if "elements" in result.details:
+            e = result.details["elements"]
+            print(f"  • Lists: {e['list_items']} items, Tables: {e['has_tables']}, Code blocks: {e['code_blocks']}")
+        if "links" in result.details:
+            l = result.details["links"]
+            print(f"  • Internal links: {l['internal_links']}, External links: {l['external_links']}")
+
+    timings = result.details.get("timings")
+    if timings:
+        print(f"\n⏱️ Timings ({timings['bytes']} bytes):")
+        print(f"  • Total: {timings['total_ms']} ms, parse: {timings['parse_ms']} ms, "
+              f"scoring: {timings['scoring_ms']} ms")
+        for name, ms in sorted(timings["auditors_ms"].items(), key=lambda kv: -kv[1]):
+            print(f"  • {name}: {ms} ms")
+        if timings["cached"]:
+            print(f"  • Cached: {', '.join(timings['cached'])}")
+
+    print(f"\n{'='*50}\n")
+
+
+def is_batch_target(target: str) -> bool:
+    """Whether a CLI target needs expansion (directory or glob pattern)."""
+    import glob
+
+    return glob.has_magic(target) or Path(target).is_dir()
+
+
+def expand_targets(targets: Iterable[str]) -> Iterator[Path]:
+    """Expand files, directories and glob patterns into markdown paths.
+
+    Directories are walked recursively for markdown files. Each path is
+    yielded once, in sorted order per target.
+    """
+    import glob
+
+    seen = set()
+    for target in targets:
+        if glob.has_magic(target):
+            candidates = sorted(Path(p) for p in glob.glob(target, recursive=True))
+        elif Path(target).is_dir():
+            candidates = sorted(
+                p for p in Path(target).rglob("*") if p.suffix.lower() in MARKDOWN_SUFFIXES
+            )
+        else:
+            candidates = [Path(target)]
+
+        for path in candidates:
+            if path.is_dir() or path in seen:
+                continue
+            seen.add(path)
+            yield path
+
+
+@dataclass(frozen=True)
+class AuditOptions:
+    """Per-run audit settings, shared by the CLI and batch workers."""
+    brand: Optional[str] = None
+    time_budget: Optional[float] = None
+    dictionary: Optional[str] = None
+    locales: Optional[tuple[str, ...]] = None
+    cache_dir: Optional[str] = None     # None disables the audit cache
+    cache_size: int = 256 << 20
+    weights: Optional[str] = None       # weights config; None keeps built-in scores
+    profile: bool = False               # add details["timings"]
+    link_graph: Optional[str] = None    # link graph from 'geo-audit.py links --graph-out'
+    stream_above: int = STREAM_ABOVE    # files larger than this many bytes are streamed
+    checks: Optional[tuple[str, ...]] = None    # auditors to run; None runs all
+    skip: tuple[str, ...] = ()
+    lang: Optional[str] = None          # render issues in output; None keeps codes
+
+    def lexicon(self) -> Lexicon:
+        return get_lexicon(self.dictionary, self.locales, self.brand)
+
+    def cache(self) -> Optional[AuditCache]:
+        return get_cache(self.cache_dir, self.cache_size) if self.cache_dir else None
+
+    def scorer(self) -> Optional[Scorer]:
+        return get_scorer(self.weights) if self.weights else None
+
+    def link_pages(self) -> Optional[dict]:
+        return load_link_graph(self.link_graph) if self.link_graph else None
+
+    def auditors(self) -> tuple[Auditor, ...]:
+        return select_auditors(self.checks, self.skip)
+
+    def audit(self, content: str) -> AuditResult:
+        return audit_content(
+            content, self.brand, self.time_budget, self.lexicon(), self.cache(), self.scorer(),
+            self.profile, self.auditors())
+
+    def audit_path(self, path: str) -> AuditResult:
+        """Audit a file, streaming it in chunks if it is over ``stream_above`` bytes."""
+        if os.path.getsize(path) > self.stream_above:
+            return audit_chunked(
+                path, self.brand, self.time_budget, self.lexicon(), self.cache(), self.scorer(),
+                self.profile, self.auditors())
+        return self.audit(Path(path).read_text(encoding="utf-8"))
+
+
+def audit_file(path: str, options: AuditOptions) -> dict:
+    """Audit one file and return a JSON-ready record (used by batch workers)."""
+    try:
+        result = options.audit_path(path)
+    except (OSError, UnicodeDecodeError) as e:
+        return {"path": path, "error": str(e)}
+    pages = options.link_pages()
+    if pages is not None and "features" in result.details:
+        apply_link_graph(result, pages.get(os.path.abspath(path)), options.scorer())
+    return {"path": path, **asdict(result)}
+
+
+def run_pool(func, items: Iterable, jobs: int, *args) -> Iterator:
+    """Apply ``func(item, *args)`` over a process pool, yielding as completed.
+
+    At most ``jobs * 4`` tasks are in flight, so memory stays flat however
+    many items are queued. ``jobs == 1`` runs inline without a pool.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item, *args)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(func, item, *args))
+            if len(pending) >= jobs * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+class FeatureStore:
+    """Binary file of feature vectors, written once and re-scored many times.
+
+    Layout: magic, a JSON header naming the columns, the row-major float32
+    matrix, the newline-separated row ids, then a trailer with the row count
+    and ids offset. Rows are appended as they come, so batch runs stream.
+    """
+
+    MAGIC = b"GEOFEAT1"
+    TRAILER = "<QQ8s"
+
+    def __init__(self, path: str, names: tuple[str, ...] = FEATURES):
+        from array import array
+
+        self.path = path
+        self.names = names
+        self.rows = 0
+        self.ids: list[str] = []
+        self.buffer = array("f")
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self.tmp, "wb")
+        header = json.dumps({"features": list(names), "dtype": "<f4"}).encode()
+        self.file.write(self.MAGIC + len(header).to_bytes(4, "little") + header)
+
+    def append(self, row_id: str, features: dict):
+        self.buffer.extend(features.get(name, 0) for name in self.names)
+        self.ids.append(row_id)
+        self.rows += 1
+        if len(self.buffer) >= 1 << 16:
+            self._flush()
+
+    def _flush(self):
+        if sys.byteorder == "big":
+            self.buffer.byteswap()
+        self.file.write(self.buffer.tobytes())
+        del self.buffer[:]
+
+    def close(self):
+        """Finish the file and move it into place atomically."""
+        import struct
+
+        self._flush()
+        ids_offset = self.file.tell()
+        self.file.write("\n".join(self.ids).encode("utf-8"))
+        self.file.write(struct.pack(self.TRAILER, self.rows, ids_offset, self.MAGIC))
+        self.file.close()
+        os.replace(self.tmp, self.path)
+
+    @classmethod
+    def read(cls, path: str) -> tuple[list[str], int, memoryview, list[str]]:
+        """Map a store: returns ``(feature names, rows, matrix buffer, row ids)``."""
+        import mmap
+        import struct
+
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        trailer = struct.calcsize(cls.TRAILER)
+        if data[:8] != cls.MAGIC or len(data) < 12 + trailer:
+            raise ValueError(f"{path}: not a feature store")
+        rows, ids_offset, magic = struct.unpack(cls.TRAILER, data[-trailer:])
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path}: truncated feature store")
+        header_len = int.from_bytes(data[8:12], "little")
+        names = json.loads(data[12:12 + header_len])["features"]
+        ids = data[ids_offset:len(data) - trailer].decode("utf-8").split("\n") if rows else []
+        matrix = memoryview(data)[12 + header_len:ids_offset]
+        return names, rows, matrix, ids
+
+
+# Codes reported outside the auditors: by the link graph and the time budget
+EXTRA_CODES = ("BROKEN_LINKS", "ORPHAN_PAGE", "AUDIT_TIMEOUT")
+
+
+class ReportTable:
+    """Audit results for bulk loading: one row per document.
+
+    Columns are ``id``, ``passed`` (0/1), ``score`` and ``error``, then the
+    :data:`FEATURES` when the features check runs, then a 0/1 column per
+    issue or suggestion code the selected auditors can report. The file
+    suffix picks CSV, TSV or Parquet (which needs pyarrow). Rows stream to
+    a temporary file that is moved into place on :meth:`close`.
+    """
+
+    FORMATS = (".csv", ".tsv", ".parquet")
+    ROW_GROUP = 1 << 16     # rows per Parquet row group
+
+    @classmethod
+    def check(cls, path: str):
+        """Raise :class:`ValueError` if ``path`` names no format this install can write."""
+        suffix = Path(path).suffix.lower()
+        if suffix not in cls.FORMATS:
+            raise ValueError(f"{path}: table output must end in {', '.join(cls.FORMATS)}")
+        if suffix == ".parquet":
+            try:
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet output needs pyarrow (pip install pyarrow)") from None
+
+    def __init__(self, path: str, auditors: Iterable[Auditor]):
+        self.check(path)
+        auditors = tuple(auditors)
+        self.features = FEATURES if any(a.name == "features" for a in auditors) else ()
+        self.codes = (*dict.fromkeys(code for a in auditors for code in a.codes), *EXTRA_CODES)
+        self.columns = ("id", "passed", "score", "error", *self.features, *self.codes)
+        self.path = path
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.rows: list[list] = []
+        self.parquet = None
+        self.csv = None
+        if path.lower().endswith(".parquet"):
+            import pyarrow as pa
+
+            self.schema = pa.schema([
+                ("id", pa.string()), ("passed", pa.int8()), ("score", pa.int16()),
+                ("error", pa.string()),
+                *((name, pa.int64()) for name in self.features),
+                *((code, pa.int8()) for code in self.codes),
+            ])
+        else:
+            import csv
+
+            self.file = open(self.tmp, "w", encoding="utf-8", newline="")
+            self.csv = csv.writer(self.file, dialect="excel-tab" if path.lower().endswith(".tsv") else "excel")
+            self.csv.writerow(self.columns)
+
+    def append(self, row_id: str, record: dict):
+        if "error" in record:
+            row = [row_id, None, None, record["error"]]
+            row += [None] * (len(self.columns) - len(row))
+        else:
+            features = record["details"].get("features", {})
+            raised = {item["code"] for item in (*record["issues"], *record["suggestions"])}
+            row = [row_id, int(record["passed"]), record["score"], None]
+            row += [features.get(name) for name in self.features]
+            row += [int(code in raised) for code in self.codes]
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.rows.append(row)
+            if len(self.rows) >= self.ROW_GROUP:
+                self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.parquet is None:
+            self.parquet = pq.ParquetWriter(self.tmp, self.schema)
+        columns = [pa.array(values, type=column.type)
+                   for values, column in zip(zip(*self.rows), self.schema)] if self.rows else None
+        if columns is not None:
+            self.parquet.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+        del self.rows[:]
+
+    def close(self):
+        """Finish the file and move it into place atomically."""
+        if self.csv is not None:
+            self.file.close()
+        else:
+            self._flush()
+            self.parquet.close()
+        os.replace(self.tmp, self.path)
+
+
+LINK_SUFFIXES = (*MARKDOWN_SUFFIXES, ".html", ".htm")
+
+
+def _link_key(path: str) -> str:
+    """Normalize a page path or link target into a link-graph key."""
+    key = "/" + path.strip().lower().lstrip("/")
+    if "%" in key:
+        from urllib.parse import unquote
+        key = unquote(key)
+    if "/." in key or "//" in key:
+        import posixpath
+        key = posixpath.normpath(key)
+    if key.endswith(LINK_SUFFIXES):
+        key = key[:key.rindex(".")]
+    if key.endswith("/index"):
+        key = key[:-len("/index")]
+    return key.strip("/")
+
+
+class LinkGraph:
+    """Internal link graph of a corpus, resolved by hash lookups.
+
+    Pages are keyed by their path under ``root`` (suffix and ``index``
+    dropped) and by their frontmatter ``slug``. A link resolves to the first
+    key it matches: root-absolute links against the site root (minus
+    ``base_path``), relative links against the linking page, then as a bare
+    slug. Links with a scheme or only an ``#anchor`` are not checked.
+    """
+
+    def __init__(self, root: str = ".", base_path: str = "/"):
+        self.root = os.path.abspath(root)
+        self.base_path = "/" + base_path.strip("/")
+        self.pages: dict[str, dict] = {}    # absolute path → page record
+        self.keys: dict[str, str] = {}      # link key → absolute path
+
+    def add(self, path: str, slug: Optional[str], targets: list[str]):
+        absolute = os.path.abspath(path)
+        prefix = self.root.rstrip(os.sep) + os.sep
+        relative = absolute[len(prefix):] if absolute.startswith(prefix) else absolute
+        relative = relative.replace(os.sep, "/")
+        self.pages[absolute] = {"path": path, "relative": relative, "targets": targets}
+        keys = [_link_key(relative)]
+        if slug:
+            keys += [_link_key(f"{os.path.dirname(relative)}/{slug}"), _link_key(slug)]
+        for key in keys:
+            self.keys.setdefault(key, absolute)
+
+    def resolve(self, target: str, relative: str) -> Optional[str]:
+        """The absolute path a link from page ``relative`` points to, if any."""
+        if target.startswith("/"):
+            if self.base_path != "/" and (target + "/").startswith(self.base_path + "/"):
+                target = target[len(self.base_path):]
+            candidates = (target,)
+        else:
+            candidates = (f"{os.path.dirname(relative)}/{target}", target)
+        for candidate in candidates:
+            page = self.keys.get(_link_key(candidate))
+            if page:
+                return page
+        return None
+
+    def validate(self) -> dict[str, dict]:
+        """Resolve every link once; returns ``{absolute path: page report}``."""
+        has_scheme = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:").match
+        inbound = dict.fromkeys(self.pages, 0)
+        reports = {}
+        for absolute, page in self.pages.items():
+            broken = []
+            outbound = set()
+            for target in page["targets"]:
+                if "#" in target or "?" in target:
+                    target = target.split("#", 1)[0].split("?", 1)[0]
+                if not target or has_scheme(target):
+                    continue
+                resolved = self.resolve(target, page["relative"])
+                if resolved is None:
+                    broken.append(target)
+                elif resolved != absolute:
+                    outbound.add(resolved)
+            for resolved in outbound:
+                inbound[resolved] += 1
+            reports[absolute] = {"path": page["path"], "outbound": len(outbound), "broken": broken}
+        for absolute, report in reports.items():
+            report["inbound"] = inbound[absolute]
+            report["orphan"] = not inbound[absolute]
+        return reports
+
+
+def index_page(path: str) -> dict:
+    """Parse one file for the link graph: its slug and link targets (used by workers)."""
+    try:
+        doc = parse_document(Path(path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError) as e:
+        return {"path": path, "error": str(e)}
+    return {"path": path, "slug": doc.frontmatter.get("slug"), "targets": [l.target for l in doc.links]}
+
+
+@lru_cache(maxsize=4)
+def load_link_graph(path: str) -> dict:
+    """Page reports from a graph file, keyed by absolute path."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["pages"]
+
+
+def apply_link_graph(result: AuditResult, page: Optional[dict], scorer: Optional[Scorer]):
+    """Add a page's link-graph report to its audit result and features."""
+    if page is None:
+        return
+    broken = page["broken"]
+    result.details["link_graph"] = {"inbound": page["inbound"], "outbound": page["outbound"], "broken": broken}
+    result.details["features"].update(inbound_links=page["inbound"], broken_links=len(broken))
+    if broken:
+        result.issues.append(issue("BROKEN_LINKS", count=len(broken), targets=broken[:3]))
+    if page["orphan"]:
+        result.suggestions.append(issue("ORPHAN_PAGE"))
+    if scorer is not None:
+        result.score, result.passed = scorer.score(result.details["features"])
+
+
+def links_main(argv: list[str]):
+    """Entry point for ``geo-audit.py links``: index and validate the corpus link graph."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="geo-audit.py links",
+        description="Build the internal link graph of a corpus and report broken links and orphans",
+    )
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="Markdown file(s), directories or glob patterns to index")
+    parser.add_argument("--root",
+                        help="Site root that page paths and /absolute links are relative to "
+                             "(default: the directory given, else the current directory)")
+    parser.add_argument("--base-path", default="/",
+                        help="URL prefix the site is served under, e.g. /blog (default: /)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per core)")
+    parser.add_argument("--graph-out", metavar="PATH",
+                        help="Write page reports as JSON for 'geo-audit.py --link-graph'")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary line")
+    args = parser.parse_args(argv)
+
+    root = args.root or (args.files[0] if len(args.files) == 1 and Path(args.files[0]).is_dir() else ".")
+    graph = LinkGraph(root, args.base_path)
+    errors = 0
+    paths = (str(p) for p in expand_targets(args.files))
+    for page in run_pool(index_page, paths, max(1, args.jobs)):
+        if "error" in page:
+            errors += 1
+            print(json.dumps(page, ensure_ascii=False), flush=True)
+        else:
+            graph.add(page["path"], page["slug"], page["targets"])
+
+    reports = graph.validate()
+    if not args.quiet:
+        for report in reports.values():
+            print(json.dumps(report, ensure_ascii=False))
+    if args.graph_out:
+        tmp = f"{args.graph_out}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"root": str(graph.root), "base_path": graph.base_path, "pages": reports},
+                      f, ensure_ascii=False)
+        os.replace(tmp, args.graph_out)
+
+    broken = sum(len(r["broken"]) for r in reports.values())
+    summary = {
+        "pages": len(reports),
+        "links": sum(len(p["targets"]) for p in graph.pages.values()),
+        "broken_links": broken,
+        "pages_with_broken_links": sum(bool(r["broken"]) for r in reports.values()),
+        "orphans": sum(r["orphan"] for r in reports.values()),
+        "errors": errors,
+    }
+    print(json.dumps({"summary": summary}, ensure_ascii=False), flush=True)
+    sys.exit(1 if broken or errors else 0)
+
+
+# Each Han character is a token, any other whitespace-separated run is a
+# word (the pre-segment() split, kept so stored signatures stay comparable)
+TOKEN_SOURCE = r'[\u4e00-\u9fff\u3400-\u4dbf]|[^\s\u4e00-\u9fff\u3400-\u4dbf]+'
+
+
+@lru_cache(maxsize=None)
+def token_pattern() -> re.Pattern:
+    """:data:`TOKEN_SOURCE`, compiled when a MinHash run first needs it."""
+    return re.compile(TOKEN_SOURCE)
+
+
+@dataclass(frozen=True)
+class MinHasher:
+    """MinHash signatures over token shingles, by one-permutation hashing.
+
+    Each shingle of ``shingle`` consecutive tokens is hashed once to 64
+    bits; the low bits pick one of ``num_perm`` bins and the bin keeps the
+    smallest remaining bits. Empty bins borrow the next filled bin's value
+    (densification), so a signature costs one pass over the shingles
+    instead of one per permutation.
+    """
+    num_perm: int = 128
+    shingle: int = 5
+
+    def shingles(self, text: str) -> set[int]:
+        import hashlib
+
+        tokens = token_pattern().findall(text.lower())
+        k = min(self.shingle, len(tokens))
+        return {
+            int.from_bytes(hashlib.blake2b(" ".join(tokens[i:i + k]).encode("utf-8"),
+                                           digest_size=8).digest(), "big")
+            for i in range(len(tokens) - k + 1)
+        } if tokens else set()
+
+    def signature(self, text: str) -> Optional[list[int]]:
+        """MinHash signature of ``text``, or ``None`` when it has no tokens."""
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+        bins = self.num_perm
+        empty = 1 << 64
+        signature = [empty] * bins
+        for h in hashes:
+            b, value = h % bins, h // bins
+            if value < signature[b]:
+                signature[b] = value
+        if empty in signature:
+            filled = signature[:]
+            for i in range(bins):
+                if filled[i] == empty:
+                    j = 1
+                    while filled[(i + j) % bins] == empty:
+                        j += 1
+                    # Mix in the distance so borrowed values rarely match by chance
+                    signature[i] = (filled[(i + j) % bins] + j * 0x9E3779B97F4A7C15) & (empty - 1)
+        return signature
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+@lru_cache(maxsize=16)
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """LSH ``(bands, rows)`` minimizing false positives plus false negatives at ``threshold``."""
+    def area(f, lo, hi, steps=50):
+        width = (hi - lo) / steps
+        return sum(f(lo + (i + 0.5) * width) for i in range(steps)) * width
+
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            error = (area(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+                     + area(lambda s: (1 - s ** rows) ** bands, threshold, 1.0))
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class DuplicateIndex:
+    """MinHash signatures and their LSH buckets, stored in SQLite.
+
+    Each document's signature is cut into bands; documents sharing any band
+    bucket are candidates, confirmed by their estimated similarity. Lookups
+    touch one indexed bucket per band, so checking a new document costs the
+    same however large the corpus is.
+    """
+
+    def __init__(self, path: str, hasher: MinHasher, threshold: float):
+        import sqlite3
+
+        self.hasher = hasher
+        self.threshold = threshold
+        self.bands, self.rows = lsh_bands(hasher.num_perm, threshold)
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS docs (path TEXT PRIMARY KEY, content_hash TEXT, signature BLOB);"
+            "CREATE TABLE IF NOT EXISTS buckets (band INTEGER, bucket INTEGER, path TEXT);"
+            "CREATE INDEX IF NOT EXISTS buckets_key ON buckets (band, bucket);"
+            "CREATE INDEX IF NOT EXISTS buckets_path ON buckets (path);"
+        )
+        # Buckets are fixed when the store is created; a later run with another
+        # threshold keeps them and only confirms matches at its own threshold.
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if row is None:
+            params = {**asdict(hasher), "bands": self.bands, "rows": self.rows}
+            self._db.execute("INSERT INTO meta VALUES ('params', ?)", (json.dumps(params),))
+        else:
+            params = json.loads(row[0])
+            if {k: params[k] for k in asdict(hasher)} != asdict(hasher):
+                raise ValueError(f"{path} was built with other settings ({row[0]}); use another --db")
+            self.bands, self.rows = params["bands"], params["rows"]
+        self._db.commit()
+
+    def _buckets(self, signature: list[int]) -> list[tuple[int, int]]:
+        import hashlib
+
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(repr(rows).encode(), digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+        return buckets
+
+    @staticmethod
+    def _pack(signature: list[int]) -> bytes:
+        from array import array
+
+        return array("Q", signature).tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> list[int]:
+        from array import array
+
+        signature = array("Q")
+        signature.frombytes(blob)
+        return signature.tolist()
+
+    def stored(self, path: str) -> Optional[tuple[str, Optional[list[int]]]]:
+        """``(content hash, signature)`` stored for ``path``, if any."""
+        row = self._db.execute(
+            "SELECT content_hash, signature FROM docs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        return row[0], self._unpack(row[1]) if row[1] is not None else None
+
+    def matches(self, path: str, signature: list[int]) -> list[tuple[str, float]]:
+        """Stored documents at least ``threshold`` similar to ``signature``."""
+        candidates = set()
+        for band, bucket in self._buckets(signature):
+            candidates.update(row[0] for row in self._db.execute(
+                "SELECT path FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+        candidates.discard(path)
+        found = []
+        for other in sorted(candidates):
+            stored = self.stored(other)
+            if stored is None or stored[1] is None:
+                continue
+            if not os.path.exists(other):     # deleted since it was indexed
+                self.remove(other)
+                continue
+            score = similarity(signature, stored[1])
+            if score >= self.threshold:
+                found.append((other, score))
+        return found
+
+    def add(self, path: str, content_hash: str, signature: Optional[list[int]]):
+        self.remove(path)
+        self._db.execute(
+            "INSERT INTO docs VALUES (?, ?, ?)",
+            (path, content_hash, self._pack(signature) if signature is not None else None))
+        if signature is not None:
+            self._db.executemany(
+                "INSERT INTO buckets VALUES (?, ?, ?)",
+                [(band, bucket, path) for band, bucket in self._buckets(signature)])
+
+    def remove(self, path: str):
+        self._db.execute("DELETE FROM docs WHERE path = ?", (path,))
+        self._db.execute("DELETE FROM buckets WHERE path = ?", (path,))
+
+    def commit(self):
+        self._db.commit()
+
+
+def minhash_file(item: tuple[str, Optional[str]], hasher: MinHasher) -> dict:
+    """Sign one file unless its content hash is unchanged (used by workers)."""
+    path, known_hash = item
+    try:
+        content = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return {"path": path, "error": str(e)}
+    content_hash = AuditCache.content_hash(content)
+    if content_hash == known_hash:
+        return {"path": path, "content_hash": content_hash, "unchanged": True}
+    return {"path": path, "content_hash": content_hash, "signature": hasher.signature(content)}
+
+
+def dupes_main(argv: list[str]):
+    """Entry point for ``geo-audit.py dupes``: near-duplicate clusters via MinHash/LSH."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="geo-audit.py dupes",
+        description="Find near-duplicate documents (MinHash signatures, LSH buckets)",
+    )
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="Markdown file(s), directories or glob patterns to check")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="Estimated Jaccard similarity to flag, 0-1 (default: 0.8)")
+    parser.add_argument("--db", metavar="PATH",
+                        help="SQLite signature store; new documents are checked against "
+                             "everything stored before (default: in memory, this run only)")
+    parser.add_argument("--shingle", type=int, default=5, help="Tokens per shingle (default: 5)")
+    parser.add_argument("--num-perm", type=int, default=128,
+                        help="MinHash permutations (default: 128)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    hasher = MinHasher(num_perm=args.num_perm, shingle=args.shingle)
+    try:
+        index = DuplicateIndex(args.db or ":memory:", hasher, args.threshold)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    def items():
+        for path in expand_targets(args.files):
+            path = os.path.abspath(path)
+            stored = index.stored(path)
+            yield path, stored[0] if stored else None
+
+    parent: dict[str, str] = {}
+
+    def find(path):
+        while parent.get(path, path) != path:
+            parent[path] = parent.get(parent[path], parent[path])    # path halving
+            path = parent[path]
+        return path
+
+    pairs = []
+    documents = errors = 0
+    for record in run_pool(minhash_file, items(), max(1, args.jobs), hasher):
+        if "error" in record:
+            errors += 1
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+            continue
+        documents += 1
+        path = record["path"]
+        if record.get("unchanged"):
+            signature = index.stored(path)[1]
+        else:
+            signature = record["signature"]
+            index.add(path, record["content_hash"], signature)
+        if signature is None:
+            continue
+        for other, score in index.matches(path, signature):
+            pair = tuple(sorted((path, other)))
+            pairs.append((*pair, score))
+            parent[find(pair[0])] = find(pair[1])
+    index.commit()
+
+    # One record per cluster; a pair can be seen from both ends
+    clusters: dict[str, dict] = {}
+    for a, b, score in sorted(set(pairs)):
+        cluster = clusters.setdefault(find(a), {"documents": set(), "pairs": []})
+        cluster["documents"].update((a, b))
+        cluster["pairs"].append({"a": a, "b": b, "similarity": round(score, 3)})
+    for cluster in sorted(clusters.values(), key=lambda c: -len(c["documents"])):
+        print(json.dumps({"cluster": sorted(cluster["documents"]), "pairs": cluster["pairs"]},
+                         ensure_ascii=False))
+
+    summary = {
+        "documents": documents,
+        "clusters": len(clusters),
+        "near_duplicates": sum(len(c["documents"]) for c in clusters.values()),
+        "threshold": args.threshold,
+        "lsh": {"bands": index.bands, "rows": index.rows},
+        "errors": errors,
+    }
+    print(json.dumps({"summary": summary}, ensure_ascii=False), flush=True)
+    sys.exit(1 if clusters or errors else 0)
+
+
+class Hotspots:
+    """Per-run aggregate of ``--profile`` timings: costly stages and documents."""
+
+    SLOWEST = 10    # documents kept in the slowest-documents table
+
+    def __init__(self):
+        self.documents = 0
+        self.bytes = 0
+        self.stages: dict[str, float] = {}      # stage → total ms
+        self.worst: dict[str, tuple[float, str]] = {}   # stage → (ms, path)
+        self.slowest: list[tuple[float, str, str]] = []  # heap of (ms, path, top stage)
+
+    def add(self, path: str, timings: dict):
+        import heapq
+
+        self.documents += 1
+        self.bytes += timings["bytes"]
+        stages = {"parse_document": timings["parse_ms"] - timings["lexicon_scan_ms"],
+                  "lexicon_scan": timings["lexicon_scan_ms"], **timings["auditors_ms"]}
+        for stage, ms in stages.items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + ms
+            if ms > self.worst.get(stage, (-1.0, ""))[0]:
+                self.worst[stage] = (ms, path)
+        top = max(stages, key=stages.get)
+        entry = (timings["total_ms"], path, top)
+        if len(self.slowest) < self.SLOWEST:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def report(self) -> dict:
+        total = sum(self.stages.values()) or 1.0
+        return {
+            "documents": self.documents,
+            "bytes": self.bytes,
+            "stages": [
+                {"stage": stage, "total_ms": round(ms, 3), "share": round(ms / total, 4),
+                 "worst_ms": round(self.worst[stage][0], 3), "worst_path": self.worst[stage][1]}
+                for stage, ms in sorted(self.stages.items(), key=lambda kv: -kv[1])
+            ],
+            "slowest": [
+                {"path": path, "total_ms": ms, "top_stage": stage}
+                for ms, path, stage in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+    def print_table(self, file=sys.stderr):
+        report = self.report()
+        print(f"\nHotspots ({report['documents']} documents, {report['bytes'] / 1e6:.2f} MB):", file=file)
+        print(f"  {'stage':<26} {'total ms':>12} {'share':>7} {'worst ms':>10}  worst document", file=file)
+        for row in report["stages"]:
+            print(f"  {row['stage']:<26} {row['total_ms']:>12.1f} {row['share']:>7.1%} "
+                  f"{row['worst_ms']:>10.1f}  {row['worst_path']}", file=file)
+        print(f"\n  {'slowest documents':<40} {'total ms':>12}  top stage", file=file)
+        for row in report["slowest"]:
+            print(f"  {row['path']:<40} {row['total_ms']:>12.1f}  {row['top_stage']}", file=file)
+
+
+class TDigest:
+    """Mergeable approximate quantiles: a merging t-digest.
+
+    Values are buffered and folded into at most about ``compression``
+    centroids, small at the tails and larger in the middle, so extreme
+    quantiles stay accurate in constant memory. Digests merge by folding
+    one's centroids into the other.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.centroids: list[tuple[float, float]] = []     # (mean, weight), by mean
+        self.buffer: list[tuple[float, float]] = []
+        self.count = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float, weight: float = 1.0):
+        self.buffer.append((value, weight))
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self.buffer) >= 8 * self.compression:
+            self._compress()
+
+    def _compress(self):
+        import math
+
+        if not self.buffer:
+            return
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        scale = self.compression / (2 * math.pi)
+
+        def weight_limit(done: float) -> float:
+            # Cumulative weight where the next centroid must end: one unit
+            # of the k1 scale function k(q) = scale * asin(2q - 1) further on
+            k = scale * math.asin(2 * min(1.0, done / self.count) - 1) + 1
+            return self.count * (math.sin(min(k / scale, math.pi / 2)) + 1) / 2
+
+        merged = []
+        done = 0.0
+        limit = weight_limit(done)
+        mean, weight = points[0]
+        for value, w in points[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                done += weight
+                limit = weight_limit(done)
+                mean, weight = value, w
+        merged.append((mean, weight))
+        self.centroids = merged
+
+    def merge(self, other: "TDigest"):
+        other._compress()
+        if other.count:
+            self.buffer.extend(other.centroids)
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The approximate ``q``-quantile (0..1), or ``None`` if nothing was added."""
+        self._compress()
+        if not self.count:
+            return None
+        # Interpolate between centroid means, each placed at the middle of its
+        # weight, with min and max at the ends
+        points = [(0.0, self.min)]
+        done = 0.0
+        for mean, weight in self.centroids:
+            points.append((done + weight / 2, mean))
+            done += weight
+        points.append((self.count, self.max))
+        target = q * self.count
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            if x1 >= target:
+                return y1 if x1 == x0 else y0 + (y1 - y0) * (target - x0) / (x1 - x0)
+        return self.max
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {"compression": self.compression, "centroids": self.centroids,
+                "min": self.min, "max": self.max} if self.count else {"compression": self.compression}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        digest = cls(data["compression"])
+        for mean, weight in data.get("centroids", ()):
+            digest.centroids.append((mean, weight))
+            digest.count += weight
+        if digest.count:
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+
+class TopGroups:
+    """The ``capacity`` largest groups by document count (Space-Saving).
+
+    Each kept group tracks ``[count, error, passed, score_sum]``. A group
+    that displaced an evicted one inherits its count as ``error``, so
+    ``count`` overestimates by at most ``error``; pass rates and means are
+    over the ``count - error`` documents actually seen. Summaries merge by
+    adding counters, a group missing from a full summary being charged
+    that summary's smallest count, then keeping the largest groups.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.groups: dict[str, list] = {}
+
+    def add(self, key: str, passed: bool, score: int):
+        entry = self.groups.get(key)
+        if entry is None:
+            if len(self.groups) < self.capacity:
+                entry = self.groups[key] = [0, 0, 0, 0]
+            else:
+                evicted = min(self.groups, key=lambda k: self.groups[k][0])
+                floor = self.groups.pop(evicted)[0]
+                entry = self.groups[key] = [floor, floor, 0, 0]
+        entry[0] += 1
+        entry[2] += passed
+        entry[3] += score
+
+    def _floor(self) -> int:
+        if len(self.groups) < self.capacity:
+            return 0
+        return min(entry[0] for entry in self.groups.values())
+
+    def merge(self, other: "TopGroups"):
+        mine, theirs = self._floor(), other._floor()
+        merged = {}
+        for key in self.groups.keys() | other.groups.keys():
+            a = self.groups.get(key, [mine, mine, 0, 0])
+            b = other.groups.get(key, [theirs, theirs, 0, 0])
+            merged[key] = [x + y for x, y in zip(a, b)]
+        keep = sorted(merged, key=lambda k: -merged[k][0])[:self.capacity]
+        self.groups = {key: merged[key] for key in keep}
+
+    def report(self, limit: int = 20) -> list[dict]:
+        rows = []
+        for key in sorted(self.groups, key=lambda k: -self.groups[k][0])[:limit]:
+            count, error, passed, score_sum = self.groups[key]
+            seen = count - error
+            rows.append({
+                "group": key, "documents": count, "error": error,
+                "pass_rate": round(passed / seen, 4) if seen else None,
+                "mean_score": round(score_sum / seen, 1) if seen else None,
+            })
+        return rows
+
+
+class CorpusAggregate:
+    """Mergeable corpus report, folded one audit record at a time.
+
+    Memory is bounded whatever the corpus size: exact counts per score
+    (scores are 0-100) and per issue code (a fixed vocabulary), a
+    :class:`TDigest` of document lengths, and :class:`TopGroups` per
+    directory and per brand. :meth:`to_dict` and :meth:`from_dict` carry
+    the state between sharded runs and ``geo-audit.py summary``.
+    """
+
+    VERSION = 1
+    QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+    TOP_CODES = 10
+
+    def __init__(self):
+        self.documents = self.passed = self.errors = self.timeouts = 0
+        self.scores = [0] * 101
+        self.codes: dict[str, int] = {}
+        self.words = TDigest()
+        self.directories = TopGroups()
+        self.brands = TopGroups()
+
+    def add(self, name: str, record: dict, brand: Optional[str] = None):
+        if "error" in record:
+            self.errors += 1
+            return
+        score = min(100, max(0, record["score"]))
+        self.documents += 1
+        self.passed += record["passed"]
+        self.scores[score] += 1
+        details = record["details"]
+        self.timeouts += bool(details.get("timeout"))
+        for code in {item["code"] for item in (*record["issues"], *record["suggestions"])}:
+            self.codes[code] = self.codes.get(code, 0) + 1
+        if "features" in details:
+            self.words.add(details["features"]["words"])
+        self.directories.add(os.path.dirname(name) or ".", record["passed"], score)
+        if brand:
+            self.brands.add(brand, record["passed"], score)
+
+    def merge(self, other: "CorpusAggregate"):
+        self.documents += other.documents
+        self.passed += other.passed
+        self.errors += other.errors
+        self.timeouts += other.timeouts
+        self.scores = [a + b for a, b in zip(self.scores, other.scores)]
+        for code, count in other.codes.items():
+            self.codes[code] = self.codes.get(code, 0) + count
+        self.words.merge(other.words)
+        self.directories.merge(other.directories)
+        self.brands.merge(other.brands)
+
+    def score_quantile(self, q: float) -> Optional[int]:
+        """Exact ``q``-quantile of the scores (nearest rank)."""
+        import math
+
+        if not self.documents:
+            return None
+        rank = max(1, math.ceil(q * self.documents))
+        seen = 0
+        for score, count in enumerate(self.scores):
+            seen += count
+            if seen >= rank:
+                return score
+        return 100
+
+    def report(self) -> dict:
+        n = self.documents
+        bands = {f"{lo}-{lo + 9 if lo < 90 else 100}": sum(self.scores[lo:lo + 10 if lo < 90 else 101])
+                 for lo in range(0, 100, 10)}
+        top = sorted(self.codes.items(), key=lambda kv: (-kv[1], kv[0]))[:self.TOP_CODES]
+        report = {
+            "documents": n,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "pass_rate": round(self.passed / n, 4) if n else None,
+            "mean_score": round(sum(s * c for s, c in enumerate(self.scores)) / n, 1) if n else None,
+            "score_quantiles": {f"p{round(q * 100)}": self.score_quantile(q) for q in self.QUANTILES},
+            "score_histogram": bands,
+            "top_issues": [{"code": code, "documents": count, "share": round(count / n, 4)}
+                           for code, count in top],
+            "by_directory": self.directories.report(),
+        }
+        if self.words.count:
+            report["words_quantiles"] = {f"p{round(q * 100)}": round(self.words.quantile(q))
+                                         for q in self.QUANTILES}
+        if self.brands.groups:
+            report["by_brand"] = self.brands.report()
+        return report
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "documents": self.documents, "passed": self.passed,
+            "errors": self.errors, "timeouts": self.timeouts,
+            "scores": self.scores, "codes": self.codes,
+            "words": self.words.to_dict(),
+            "directories": {"capacity": self.directories.capacity, "groups": self.directories.groups},
+            "brands": {"capacity": self.brands.capacity, "groups": self.brands.groups},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CorpusAggregate":
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"unsupported summary version {data.get('version')!r}")
+        aggregate = cls()
+        for key in ("documents", "passed", "errors", "timeouts", "scores", "codes"):
+            setattr(aggregate, key, data[key])
+        aggregate.words = TDigest.from_dict(data["words"])
+        for key in ("directories", "brands"):
+            groups = TopGroups(data[key]["capacity"])
+            groups.groups = data[key]["groups"]
+            setattr(aggregate, key, groups)
+        return aggregate
+
+    def save(self, path: str):
+        """Write the state as JSON, atomically."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusAggregate":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+@dataclass(frozen=True)
+class BatchOutputs:
+    """Where a batch run's results go besides its final summary line."""
+    records: bool = True                # one NDJSON record per document on stdout
+    features_out: Optional[str] = None  # FeatureStore for 'rescore'
+    table_out: Optional[str] = None     # ReportTable (.csv, .tsv or .parquet)
+    report: bool = False                # add the CorpusAggregate report to the summary
+    summary_out: Optional[str] = None   # CorpusAggregate state for 'summary'
+
+
+class BatchSummary:
+    """Running totals for a stream of audit records, ending in a summary line."""
+
+    def __init__(self, options: AuditOptions, outputs: BatchOutputs = BatchOutputs()):
+        self.total = self.passed = self.errors = self.timeouts = self.score_sum = 0
+        self.outputs = outputs
+        self.brand = options.brand
+        self.store = FeatureStore(outputs.features_out) if outputs.features_out else None
+        self.table = ReportTable(outputs.table_out, options.auditors()) if outputs.table_out else None
+        self.aggregate = CorpusAggregate() if outputs.report or outputs.summary_out else None
+        self.hotspots = Hotspots() if options.profile else None
+
+    def add(self, name: str, record: dict):
+        self.total += 1
+        if self.table:
+            self.table.append(name, record)
+        if self.aggregate:
+            self.aggregate.add(name, record, record.get("brand", self.brand))
+        if "error" in record:
+            self.errors += 1
+            return
+        self.score_sum += record["score"]
+        self.passed += record["passed"]
+        details = record["details"]
+        self.timeouts += bool(details.get("timeout"))
+        if self.store and "features" in details:
+            self.store.append(name, details["features"])
+        if self.hotspots and "timings" in details:
+            self.hotspots.add(name, details["timings"])
+
+    def finish(self, **extra) -> int:
+        """Print the summary line; returns 0 when every record passed, 1 otherwise."""
+        if self.store:
+            self.store.close()
+        if self.table:
+            self.table.close()
+        if self.outputs.summary_out:
+            self.aggregate.save(self.outputs.summary_out)
+        audited = self.total - self.errors
+        summary = {
+            "files": self.total,
+            "passed": self.passed,
+            "failed": audited - self.passed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "mean_score": round(self.score_sum / audited, 1) if audited else None,
+            **extra,
+        }
+        if self.outputs.report:
+            summary["report"] = self.aggregate.report()
+        if self.hotspots:
+            summary["hotspots"] = self.hotspots.report()
+            self.hotspots.print_table(file=sys.stderr)
+        print(json.dumps({"summary": summary}, ensure_ascii=False), flush=True)
+        return 0 if self.total and self.passed == self.total else 1
+
+
+def run_batch(
+    targets: list[str],
+    options: AuditOptions,
+    jobs: int,
+    outputs: BatchOutputs = BatchOutputs(),
+) -> int:
+    """Audit every matched file, streaming one NDJSON record per document.
+
+    A final ``{"summary": ...}`` line reports totals. ``outputs`` can add a
+    :class:`FeatureStore`, a :class:`ReportTable` and a corpus report, or
+    leave out the per-document records. Returns the exit code: 0 when
+    every document passed, 1 otherwise.
+    """
+    summary = BatchSummary(options, outputs)
+    paths = (str(p) for p in expand_targets(targets))
+    for record in run_pool(audit_file, paths, jobs, options):
+        summary.add(record["path"], record)
+        if outputs.records:
+            print(json.dumps(localize(record, options.lang), ensure_ascii=False), flush=True)
+    return summary.finish()
+
+
+@dataclass(frozen=True)
+class GitChange:
+    """A markdown file changed between two revisions, with its blob ids."""
+    status: str                     # A, M, D, R (renamed), C (copied), T
+    path: str
+    old_path: Optional[str] = None
+    old_blob: Optional[str] = None  # None when added
+    new_blob: Optional[str] = None  # None when deleted
+
+
+def git_changed_markdown(revision_range: str) -> list[GitChange]:
+    """Markdown files changed in ``A..B`` (or ``A...B``), from ``git diff --raw``."""
+    import subprocess
+
+    output = subprocess.run(
+        ["git", "diff", "--raw", "-z", "--no-abbrev", "-M", revision_range, "--"],
+        check=True, capture_output=True,
+    ).stdout.decode("utf-8", "surrogateescape")
+    fields = output.split("\0")
+    changes = []
+    i = 0
+    while i < len(fields) - 1:
+        # ":<old mode> <new mode> <old blob> <new blob> <status>", then the path(s)
+        old_mode, new_mode, old_blob, new_blob, status = fields[i][1:].split(" ")
+        kind = status[0]
+        if kind in "RC":
+            old_path, path = fields[i + 1], fields[i + 2]
+            i += 3
+        else:
+            old_path, path = None, fields[i + 1]
+            i += 2
+        if "160000" in (old_mode, new_mode) or Path(path).suffix.lower() not in MARKDOWN_SUFFIXES:
+            continue
+        changes.append(GitChange(
+            status=kind,
+            path=path,
+            old_path=old_path,
+            old_blob=None if set(old_blob) == {"0"} else old_blob,
+            new_blob=None if set(new_blob) == {"0"} else new_blob,
+        ))
+    return changes
+
+
+class GitBlobReader:
+    """Reads blobs through one long-lived ``git cat-file --batch`` process."""
+
+    def __init__(self):
+        import subprocess
+
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, blob: str) -> bytes:
+        self.process.stdin.write(blob.encode() + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise ValueError(f"cannot read blob {blob}: {b' '.join(header).decode()}")
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)     # trailing newline
+        return data
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def audit_change(item: tuple, options: AuditOptions) -> dict:
+    """Audit the base and head versions of one changed document (used by git workers)."""
+    change, base, head = item
+    record = {"path": change["path"], "status": change["status"]}
+    if change["old_path"]:
+        record["old_path"] = change["old_path"]
+    try:
+        base_result = options.audit(base.decode("utf-8")) if base is not None else None
+        head_result = options.audit(head.decode("utf-8")) if head is not None else None
+    except UnicodeDecodeError as e:
+        return {**record, "error": str(e)}
+    record["base_score"] = base_result.score if base_result else None
+    if head_result is None:
+        return record
+    record["delta"] = head_result.score - base_result.score if base_result else None
+    return {**record, **asdict(head_result)}
+
+
+def run_git_range(revision_range: str, options: AuditOptions, jobs: int,
+                  outputs: BatchOutputs = BatchOutputs()) -> int:
+    """Audit markdown changed in a revision range straight from git objects.
+
+    Streams one NDJSON record per changed document: the head result plus
+    ``base_score`` and ``delta``. Deleted documents report only their base
+    score. Returns the exit code: 0 when every head document passed (or
+    there were none).
+    """
+    import subprocess
+
+    try:
+        changes = git_changed_markdown(revision_range)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        print(f"Error: git diff {revision_range} failed: {stderr.decode().strip() or e}",
+              file=sys.stderr)
+        return 2
+
+    summary = BatchSummary(options, outputs)
+    deltas = []
+    with GitBlobReader() as blobs:
+        # Blobs are read lazily, as the pool takes more work
+        items = (
+            (asdict(change),
+             blobs.read(change.old_blob) if change.old_blob else None,
+             blobs.read(change.new_blob) if change.new_blob else None)
+            for change in changes
+        )
+        for record in run_pool(audit_change, items, jobs, options):
+            if "score" in record or "error" in record:
+                summary.add(record["path"], record)
+            if record.get("delta") is not None:
+                deltas.append(record["delta"])
+            if outputs.records:
+                print(json.dumps(localize(record, options.lang), ensure_ascii=False), flush=True)
+
+    code = summary.finish(
+        range=revision_range,
+        changed=len(changes),
+        improved=sum(d > 0 for d in deltas),
+        regressed=sum(d < 0 for d in deltas),
+        mean_delta=round(sum(deltas) / len(deltas), 1) if deltas else None,
+    )
+    # Nothing left to audit (no markdown changed, or only deletions) passes
+    return code if summary.total else 0
+
+
+def audit_record(line: bytes, options: AuditOptions) -> dict:
+    """Audit one ``{id, markdown, brand?}`` NDJSON record (used by stream workers)."""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return {"id": None, "error": f"invalid JSON: {e}"}
+    if not isinstance(record, dict) or not isinstance(record.get("markdown"), str):
+        return {"id": record.get("id") if isinstance(record, dict) else None,
+                "error": "expected {id, markdown, brand?}"}
+    if record.get("brand") is None:
+        return {"id": record.get("id"), **asdict(options.audit(record["markdown"]))}
+    options = replace(options, brand=record["brand"])
+    return {"id": record.get("id"), "brand": record["brand"], **asdict(options.audit(record["markdown"]))}
+
+
+async def audit_stream(
+    reader,
+    write: Callable[[bytes], None],
+    options: AuditOptions,
+    jobs: int,
+    ordered: bool = True,
+    queue_size: Optional[int] = None,
+    outputs: BatchOutputs = BatchOutputs(),
+) -> int:
+    """Audit NDJSON records from ``reader`` concurrently, writing NDJSON results.
+
+    At most ``queue_size`` records are read ahead of the results written, so
+    a slow consumer or a long stream never piles up in memory: reading
+    simply pauses. Results follow input order when ``ordered``, otherwise
+    completion order. Ends with the batch summary line; returns its exit code.
+    """
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    queue_size = queue_size or jobs * 4
+    summary = BatchSummary(options, outputs)
+    executor = (ProcessPoolExecutor(jobs) if jobs > 1
+                else ThreadPoolExecutor(1, thread_name_prefix="geo-audit"))
+
+    def emit(record: dict):
+        summary.add(str(record["id"]), record)
+        if outputs.records:
+            write((json.dumps(localize(record, options.lang), ensure_ascii=False) + "\n").encode("utf-8"))
+
+    async def audit(line: bytes) -> dict:
+        try:
+            return await loop.run_in_executor(executor, audit_record, line, options)
+        except Exception as e:
+            return {"id": None, "error": f"{type(e).__name__}: {e}"}
+
+    # Ordered: a FIFO of pending results drained by one writer. As completed:
+    # a semaphore of free slots, each result written by its own task.
+    pending: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    slots = asyncio.Semaphore(queue_size)
+    tasks = set()
+
+    async def write_in_order():
+        while (task := await pending.get()) is not None:
+            emit(await task)
+
+    async def write_when_done(line: bytes):
+        try:
+            emit(await audit(line))
+        finally:
+            slots.release()
+
+    writer = asyncio.ensure_future(write_in_order()) if ordered else None
+    try:
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            if ordered:
+                put = asyncio.ensure_future(pending.put(asyncio.ensure_future(audit(line))))
+                await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if writer.done():       # output failed: stop reading
+                    put.cancel()
+                    writer.result()
+            else:
+                await slots.acquire()
+                task = asyncio.ensure_future(write_when_done(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if ordered:
+            await pending.put(None)
+            await writer
+        elif tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        executor.shutdown(wait=True)
+    return summary.finish()
+
+
+async def open_stdin(limit: int):
+    """An async line reader over stdin for lines of up to ``limit`` bytes.
+
+    Pipes and sockets get a non-blocking stream reader that buffers at most
+    a couple of megabytes ahead of the consumer. Regular files and terminals
+    cannot, so their lines are read one at a time on a helper thread.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    # A StreamReader pauses its transport only past twice its limit, so the
+    # limit stays small and longer lines are stitched together below.
+    reader = asyncio.StreamReader(limit=1 << 20)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    except ValueError:
+        reader = None
+
+    if reader is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(1, thread_name_prefix="geo-audit-stdin")
+
+        class FileLines:
+            async def readline(self) -> bytes:
+                return await loop.run_in_executor(executor, sys.stdin.buffer.readline, limit)
+
+        return FileLines()
+
+    class PipeLines:
+        async def readline(self) -> bytes:
+            parts = []
+            size = 0
+            while True:
+                try:
+                    parts.append(await reader.readuntil(b"\n"))
+                    break
+                except asyncio.LimitOverrunError as e:
+                    size += e.consumed
+                    if size > limit:
+                        raise ValueError(f"input line longer than {limit} bytes")
+                    parts.append(await reader.readexactly(e.consumed))
+                except asyncio.IncompleteReadError as e:
+                    parts.append(e.partial)     # last line without a newline, or EOF
+                    break
+            return b"".join(parts)
+
+    return PipeLines()
+
+
+def stdin_ndjson_main(options: AuditOptions, jobs: int, ordered: bool, queue_size: Optional[int],
+                      outputs: BatchOutputs) -> int:
+    """Run :func:`audit_stream` over stdin and stdout."""
+    import asyncio
+
+    async def run():
+        reader = await open_stdin(256 << 20)
+        out = sys.stdout.buffer
+
+        def write(data: bytes):
+            out.write(data)
+            out.flush()
+
+        return await audit_stream(reader, write, options, jobs, ordered, queue_size, outputs)
+
+    return asyncio.run(run())
+
+
+class AuditServer:
+    """Long-running audit service speaking JSON lines.
+
+    Requests are ``{"id", "content", "brand"?, "lang"?}`` and get ``{"id", "result"}``
+    (or ``{"id", "error"}``) back, possibly out of order. ``{"op": "health"}``,
+    ``{"op": "stats"}`` and ``{"op": "shutdown"}`` are control requests.
+    """
+
+    LATENCY_WINDOW = 1024   # recent requests kept for latency percentiles
+
+    def __init__(self, options: AuditOptions, workers: int = 1):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        self.options = options
+        self.workers = workers
+        # One thread keeps the event loop responsive; processes add parallelism
+        self.executor = (ProcessPoolExecutor(workers) if workers > 1
+                         else ThreadPoolExecutor(1, thread_name_prefix="geo-audit"))
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.tasks: set = set()
+        self.stopping = None    # asyncio.Event, created inside the loop
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3) if ordered else None
+
+        return {
+            "uptime": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            "latency_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": percentile(1.0)},
+        }
+
+    async def handle(self, line: bytes) -> Optional[dict]:
+        """Answer one request line; ``None`` for blank lines."""
+        import asyncio
+
+        if not line.strip():
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.errors += 1
+            return {"id": None, "error": f"invalid JSON: {e}"}
+        request_id = request.get("id") if isinstance(request, dict) else None
+
+        op = request.get("op", "audit") if isinstance(request, dict) else None
+        if op == "health":
+            return {"id": request_id, "ok": not self.stopping.is_set()}
+        if op == "stats":
+            return {"id": request_id, "stats": self.stats()}
+        if op == "shutdown":
+            self.stopping.set()
+            return {"id": request_id, "ok": True}
+        if op != "audit" or not isinstance(request.get("content"), str):
+            self.errors += 1
+            return {"id": request_id, "error": "expected {id, content, brand?} or an op"}
+
+        options = self.options
+        if request.get("brand") is not None:
+            options = replace(options, brand=request["brand"])
+        if request.get("profile"):
+            options = replace(options, profile=True)
+        self.requests += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, options.audit, request["content"])
+        except Exception as e:
+            self.errors += 1
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            self.in_flight -= 1
+            self.latencies.append(time.perf_counter() - started)
+        return {"id": request_id, "result": localize(asdict(result), request.get("lang", options.lang))}
+
+    async def serve_stream(self, reader, write):
+        """Read requests until EOF or shutdown, answering each as it completes.
+
+        Returns once every request read from this stream has been answered.
+        """
+        import asyncio
+
+        async def respond(line):
+            response = await self.handle(line)
+            if response is not None:
+                write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        stop = asyncio.ensure_future(self.stopping.wait())
+        pending = set()
+        try:
+            while not self.stopping.is_set():
+                read = asyncio.ensure_future(reader.readline())
+                await asyncio.wait({read, stop}, return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    read.cancel()
+                    break
+                line = read.result()
+                if not line:
+                    break
+                task = asyncio.ensure_future(respond(line))
+                for tasks in (pending, self.tasks):
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        finally:
+            stop.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def drain(self):
+        """Wait for in-flight requests, then release the workers."""
+        import asyncio
+
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    async def run(self, socket_path: Optional[str] = None):
+        import asyncio
+        import signal
+
+        loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        limit = 256 << 20   # largest accepted request line
+        if socket_path is None:
+            reader = await open_stdin(limit)
+            out = sys.stdout.buffer
+
+            def write(data: bytes):
+                out.write(data)
+                out.flush()
+
+            await self.serve_stream(reader, write)
+        else:
+            async def on_connect(reader, writer):
+                try:
+                    await self.serve_stream(reader, writer.write)
+                    await writer.drain()
+                finally:
+                    writer.close()
+
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(on_connect, socket_path, limit=limit)
+            print(f"geo-audit serving on {socket_path}", file=sys.stderr, flush=True)
+            try:
+                await self.stopping.wait()
+            finally:
+                server.close()
+                await server.wait_closed()
+                os.unlink(socket_path)
+        await self.drain()
+
+
+def serve_main(argv: list[str]):
+    """Entry point for ``geo-audit.py serve``."""
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(
+        prog="geo-audit.py serve",
+        description="Serve GEO audits over JSON lines (stdin/stdout or a Unix socket)",
+    )
+    parser.add_argument("--socket", help="Unix socket path (default: stdin/stdout)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; 1 audits on a single background thread")
+    add_audit_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = AuditServer(options_from_args(args), max(1, args.workers))
+    asyncio.run(server.run(args.socket))
+
+
+def rescore_main(argv: list[str]):
+    """Entry point for ``geo-audit.py rescore``: score stored features, no markdown."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="geo-audit.py rescore",
+        description="Re-score a feature store (from --features-out) under a weights config",
+    )
+    parser.add_argument("store", help="Feature store written by a batch run")
+    parser.add_argument("--weights", help="JSON weights config (default: built-in scoring)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary line")
+    args = parser.parse_args(argv)
+
+    try:
+        names, rows, matrix, ids = FeatureStore.read(args.store)
+        scores, passed = get_scorer(args.weights).score_matrix(matrix, names, rows)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if not args.quiet:
+        quote = json.JSONEncoder(ensure_ascii=False).encode
+        verdict = ("false", "true")
+        for start in range(0, rows, 1 << 14):
+            sys.stdout.write("".join(
+                f'{{"path": {quote(path)}, "score": {score}, "passed": {verdict[ok]}}}\n'
+                for path, score, ok in zip(ids[start:start + (1 << 14)],
+                                           scores[start:start + (1 << 14)],
+                                           passed[start:start + (1 << 14)])
+            ))
+    passed_count = sum(passed)
+    summary = {
+        "files": rows,
+        "passed": passed_count,
+        "failed": rows - passed_count,
+        "mean_score": round(sum(scores) / rows, 1) if rows else None,
+    }
+    print(json.dumps({"summary": summary}, ensure_ascii=False), flush=True)
+    sys.exit(0 if rows and passed_count == rows else 1)
+
+
+def summary_main(argv: list[str]):
+    """Entry point for ``geo-audit.py summary``: merge corpus reports from sharded runs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="geo-audit.py summary",
+        description="Merge corpus summaries (from --summary-out) into one report",
+    )
+    parser.add_argument("shards", nargs="+", metavar="shard", help="Summary files to merge")
+    parser.add_argument("--out", metavar="PATH", help="Also write the merged summary state")
+    args = parser.parse_args(argv)
+
+    try:
+        merged = CorpusAggregate.load(args.shards[0])
+        for path in args.shards[1:]:
+            merged.merge(CorpusAggregate.load(path))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.out:
+        merged.save(args.out)
+    print(json.dumps({"summary": merged.report()}, ensure_ascii=False), flush=True)
+
+
+def add_audit_arguments(parser: argparse.ArgumentParser):
+    """Options shared by one-shot, batch and server modes."""
+    parser.add_argument("--brand", help="Brand name to check for binding")
+    parser.add_argument("--time-budget", type=float, default=10.0,
+                        help="Per-document time limit in seconds, 0 to disable (default: 10)")
+    parser.add_argument("--dictionary",
+                        help="JSON keyword dictionary (brands, aliases, phrases per locale)")
+    parser.add_argument("--locale",
+                        help="Comma-separated dictionary locales to match (default: all)")
+    parser.add_argument("--cache-dir", default=str(default_cache_dir()),
+                        help="Audit cache directory (default: %(default)s)")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="Audit cache size bound in MB (default: 256)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the audit cache")
+    parser.add_argument("--weights",
+                        help="JSON weights config to score feature vectors with")
+    parser.add_argument("--profile", action="store_true",
+                        help="Add per-stage timings to results (and a hotspot table in batch mode)")
+    parser.add_argument("--checks", metavar="NAMES",
+                        help="Comma-separated checks to run (default: all, see --list-checks)")
+    parser.add_argument("--skip", metavar="NAMES", help="Comma-separated checks not to run")
+    parser.add_argument("--lang", choices=sorted(MESSAGES),
+                        help="Render issues and suggestions as text in this language "
+                             f"(default: stable codes in JSON, {DEFAULT_LANG} in the report)")
+
+
+def options_from_args(args: argparse.Namespace) -> AuditOptions:
+    checks = tuple(args.checks.split(",")) if args.checks else None
+    skip = tuple(args.skip.split(",")) if args.skip else ()
+    try:
+        select_auditors(checks, skip)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    return AuditOptions(
+        brand=args.brand,
+        time_budget=args.time_budget,
+        dictionary=args.dictionary,
+        locales=tuple(args.locale.split(",")) if args.locale else None,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_size=args.cache_size << 20,
+        weights=args.weights,
+        profile=args.profile,
+        link_graph=getattr(args, "link_graph", None),
+        stream_above=getattr(args, "stream_above", STREAM_ABOVE >> 20) << 20,
+        checks=checks,
+        skip=skip,
+        lang=args.lang,
+    )
+
+
+def main():
+    if sys.argv[1:2] == ["serve"]:
+        serve_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["rescore"]:
+        rescore_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["links"]:
+        links_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["dupes"]:
+        dupes_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["summary"]:
+        summary_main(sys.argv[2:])
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GEO Content Audit Tool")
+    parser.add_argument("files", nargs="*", metavar="file",
+                        help="Markdown file(s), directories or glob patterns to audit")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--quiet", action="store_true", help="Only show score and issues")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for batch mode (default: one per core)")
+    parser.add_argument("--features-out", metavar="STORE",
+                        help="Batch mode: also write feature vectors for 'rescore'")
+    parser.add_argument("--table-out", metavar="PATH",
+                        help="Batch mode: also write one row per document, with a column per "
+                             "feature and issue code (.csv, .tsv, or .parquet with pyarrow)")
+    parser.add_argument("--summary", action="store_true",
+                        help="Batch mode: print only a corpus report (score quantiles, pass rates "
+                             "per directory and brand, top issues) instead of per-document records")
+    parser.add_argument("--summary-out", metavar="PATH",
+                        help="Batch mode: also write the corpus summary state, mergeable with "
+                             "'geo-audit.py summary'")
+    parser.add_argument("--link-graph", metavar="PATH",
+                        help="Link graph from 'links --graph-out': adds inbound/broken links per file")
+    parser.add_argument("--git-range", metavar="A..B",
+                        help="Audit markdown changed between two revisions, with score deltas")
+    parser.add_argument("--stdin-ndjson", action="store_true",
+                        help="Audit {id, markdown, brand?} records streamed on stdin")
+    parser.add_argument("--order", choices=("input", "completed"), default="input",
+                        help="--stdin-ndjson result order (default: input)")
+    parser.add_argument("--queue-size", type=int,
+                        help="--stdin-ndjson records read ahead of results (default: 4 per job)")
+    parser.add_argument("--stream-above", type=int, default=STREAM_ABOVE >> 20, metavar="MB",
+                        help="Audit files larger than this in chunks, in bounded memory "
+                             "(default: %(default)s)")
+    parser.add_argument("--list-checks", action="store_true",
+                        help="List available checks with their points, cost and inputs")
+    add_audit_arguments(parser)
+
+    args = parser.parse_args()
+    if args.list_checks:
+        for auditor in registered_auditors():
+            print(f"{auditor.name:16} {auditor.points:>3} pts  cost {auditor.cost}  "
+                  f"needs {','.join(sorted(auditor.needs))}")
+        return
+    options = options_from_args(args)
+    if args.features_out and "features" not in {a.name for a in options.auditors()}:
+        parser.error("--features-out needs the 'features' check")
+    if args.table_out:
+        try:
+            ReportTable.check(args.table_out)
+        except ValueError as e:
+            parser.error(str(e))
+    outputs = BatchOutputs(
+        records=not args.summary,
+        features_out=args.features_out,
+        table_out=args.table_out,
+        report=args.summary,
+        summary_out=args.summary_out,
+    )
+
+    if args.stdin_ndjson:
+        if args.files:
+            parser.error("--stdin-ndjson takes no file arguments")
+        sys.exit(stdin_ndjson_main(options, max(1, args.jobs), args.order == "input",
+                                   args.queue_size, outputs))
+    if args.git_range:
+        if args.files:
+            parser.error("--git-range takes no file arguments")
+        sys.exit(run_git_range(args.git_range, options, max(1, args.jobs), outputs))
+    if not args.files:
+        parser.error("at least one file is required")
+
+    # Batch mode: several targets, a directory or a glob → NDJSON stream
+    if len(args.files) > 1 or is_batch_target(args.files[0]) or args.summary or args.summary_out:
+        sys.exit(run_batch(args.files, options, max(1, args.jobs), outputs))
+
+    file_path = Path(args.files[0])
+    if not file_path.exists():
+        print(f"Error: File not found: {args.files[0]}", file=sys.stderr)
+        sys.exit(1)
+
+    result = options.audit_path(str(file_path))
+
+    if args.json:
+        print(json.dumps(localize(asdict(result), options.lang), indent=2, ensure_ascii=False))
+    else:
+        print_report(result, verbose=not args.quiet, lang=options.lang or DEFAULT_LANG)
+
+    # Exit with non-zero if audit failed
+    sys.exit(0 if result.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
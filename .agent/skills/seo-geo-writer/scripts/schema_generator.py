@@ -0,0 +1,1436 @@
+#!/usr/bin/env python3
+"""
+Schema Generator for SEO/GEO Content
+
+Generates JSON-LD structured data for articles, FAQs, and HowTo content.
+FAQ, HowTo, breadcrumb and item lists stream from the input array to the
+output, so lists of any length run in flat memory.
+
+Usage:
+    python schema-generator.py --type article --title "Title" --description "Desc" ...
+    python schema-generator.py --type faq --input faqs.json
+    python schema-generator.py --type itemlist --input catalog.json --title "Catalog" --output catalog.jsonld
+    python schema-generator.py --type combined --config config.json
+    python schema-generator.py --type combined --manifest pages.ndjson --out-dir schema/ --jobs 4
+    cat pages.ndjson | python schema-generator.py --type combined --manifest - > schema.ndjson
+    python schema-generator.py --type site --manifest pages.ndjson --site-url https://example.com --site-name Example
+    python schema-generator.py --type combined --manifest pages.ndjson --out-dir schema/ --validate
+    python schema-generator.py validate schema/ --shared schema/site.json --jobs 4
+    python schema-generator.py build pages.ndjson --site-url https://example.com --entities entities.json --out-dir schema/
+"""
+
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Container, Iterable, Iterator, Optional
+
+
+def generate_article_schema(
+    title: str,
+    description: str,
+    author_name: str,
+    author_type: str = "Organization",
+    author_url: Optional[str] = None,
+    publisher_name: Optional[str] = None,
+    publisher_logo: Optional[str] = None,
+    image_url: Optional[str] = None,
+    date_published: Optional[str] = None,
+    date_modified: Optional[str] = None,
+    canonical_url: Optional[str] = None,
+    primary_entity: Optional[str] = None,
+    secondary_entities: Optional[list] = None,
+) -> dict:
+    """Generate Article schema."""
+
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "Article",
+        "headline": title[:110],  # Max 110 chars recommended
+        "description": description,
+    }
+
+    # Author
+    author = {"@type": author_type, "name": author_name}
+    if author_url:
+        author["url"] = author_url
+    schema["author"] = author
+
+    # Publisher
+    if publisher_name:
+        publisher = {"@type": "Organization", "name": publisher_name}
+        if publisher_logo:
+            publisher["logo"] = {"@type": "ImageObject", "url": publisher_logo}
+        schema["publisher"] = publisher
+
+    # Image
+    if image_url:
+        schema["image"] = image_url
+
+    # Dates
+    from datetime import datetime
+    today = datetime.now().strftime("%Y-%m-%d")
+    schema["datePublished"] = date_published or today
+    schema["dateModified"] = date_modified or date_published or today
+
+    # Main entity
+    if canonical_url:
+        schema["mainEntityOfPage"] = {"@type": "WebPage", "@id": canonical_url}
+
+    # About/Mentions for entity relationships
+    if primary_entity:
+        schema["about"] = {"@type": "Thing", "name": primary_entity}
+
+    if secondary_entities:
+        schema["mentions"] = [
+            {"@type": "Thing", "name": entity} for entity in secondary_entities
+        ]
+
+    return schema
+
+
+def iter_faq_questions(faqs: Iterable[dict]) -> Iterator[dict]:
+    """FAQPage ``mainEntity`` entries, one Question per FAQ."""
+    for faq in faqs:
+        yield {
+            "@type": "Question",
+            "name": faq["question"],
+            "acceptedAnswer": {
+                "@type": "Answer",
+                "text": faq["answer"]
+            }
+        }
+
+
+def generate_faq_schema(faqs: Iterable[dict], lazy: bool = False) -> dict:
+    """
+    Generate FAQPage schema.
+
+    Args:
+        faqs: List of dicts with 'question' and 'answer' keys
+        lazy: Leave mainEntity an iterator, for dump_json to stream
+    """
+    questions = iter_faq_questions(faqs)
+    return {
+        "@context": "https://schema.org",
+        "@type": "FAQPage",
+        "mainEntity": questions if lazy else list(questions)
+    }
+
+
+def iter_howto_steps(steps: Iterable[dict]) -> Iterator[dict]:
+    """HowTo ``step`` entries, numbered from 1."""
+    for i, step in enumerate(steps):
+        yield {
+            "@type": "HowToStep",
+            "name": step.get("name", f"Step {i+1}"),
+            "text": step["text"],
+            **({"image": step["image"]} if step.get("image") else {}),
+            **({"url": step["url"]} if step.get("url") else {}),
+        }
+
+
+def generate_howto_schema(
+    title: str,
+    description: str,
+    steps: Iterable[dict],
+    total_time: Optional[str] = None,
+    image_url: Optional[str] = None,
+    tools: Optional[list] = None,
+    supplies: Optional[list] = None,
+    lazy: bool = False,
+) -> dict:
+    """
+    Generate HowTo schema.
+
+    Args:
+        steps: List of dicts with 'name' and 'text' keys (optional: 'image', 'url')
+        lazy: Leave step an iterator, for dump_json to stream
+    """
+    howto_steps = iter_howto_steps(steps)
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "HowTo",
+        "name": title,
+        "description": description,
+        "step": howto_steps if lazy else list(howto_steps)
+    }
+
+    if total_time:
+        schema["totalTime"] = total_time
+
+    if image_url:
+        schema["image"] = image_url
+
+    if tools:
+        schema["tool"] = [{"@type": "HowToTool", "name": t} for t in tools]
+
+    if supplies:
+        schema["supply"] = [{"@type": "HowToSupply", "name": s} for s in supplies]
+
+    return schema
+
+
+def iter_breadcrumb_items(items: Iterable[dict]) -> Iterator[dict]:
+    """BreadcrumbList ``itemListElement`` entries, positioned from 1."""
+    for i, item in enumerate(items):
+        yield {
+            "@type": "ListItem",
+            "position": i + 1,
+            "name": item["name"],
+            "item": item["url"]
+        }
+
+
+def generate_breadcrumb_schema(items: Iterable[dict], lazy: bool = False) -> dict:
+    """
+    Generate BreadcrumbList schema.
+
+    Args:
+        items: List of dicts with 'name' and 'url' keys
+        lazy: Leave itemListElement an iterator, for dump_json to stream
+    """
+    elements = iter_breadcrumb_items(items)
+    return {
+        "@context": "https://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": elements if lazy else list(elements)
+    }
+
+
+def iter_list_items(items: Iterable[dict]) -> Iterator[dict]:
+    """ItemList ``itemListElement`` entries, positioned from 1."""
+    for i, item in enumerate(items):
+        yield {
+            "@type": "ListItem",
+            "position": i + 1,
+            **({"name": item["name"]} if item.get("name") else {}),
+            "url": item["url"]
+        }
+
+
+def generate_itemlist_schema(items: Iterable[dict], name: Optional[str] = None,
+                             lazy: bool = False) -> dict:
+    """
+    Generate ItemList schema (catalog, glossary and other hub pages).
+
+    Args:
+        items: List of dicts with a 'url' key (optional: 'name')
+        lazy: Leave itemListElement an iterator, for dump_json to stream
+    """
+    schema = {"@context": "https://schema.org", "@type": "ItemList"}
+    if name:
+        schema["name"] = name
+    elements = iter_list_items(items)
+    schema["itemListElement"] = elements if lazy else list(elements)
+    return schema
+
+
+def generate_combined_schema(config: dict) -> dict:
+    """
+    Generate combined schema with @graph for multiple types.
+
+    Config should have keys: 'article', 'faqs', 'breadcrumbs' (all optional)
+    """
+    graph = []
+
+    if "article" in config:
+        graph.append(generate_article_schema(**config["article"]))
+
+    if "faqs" in config and config["faqs"]:
+        faq_schema = generate_faq_schema(config["faqs"])
+        # Remove @context for graph
+        del faq_schema["@context"]
+        graph.append(faq_schema)
+
+    if "breadcrumbs" in config and config["breadcrumbs"]:
+        bc_schema = generate_breadcrumb_schema(config["breadcrumbs"])
+        del bc_schema["@context"]
+        graph.append(bc_schema)
+
+    if "howto" in config:
+        howto_schema = generate_howto_schema(**config["howto"])
+        del howto_schema["@context"]
+        graph.append(howto_schema)
+
+    return {
+        "@context": "https://schema.org",
+        "@graph": graph
+    }
+
+
+DUMP_BATCH = 1024   # streamed items encoded per json.dumps call
+
+
+def dump_json(data, out, indent: Optional[int] = None):
+    """Write ``json.dumps(data, indent=indent, ensure_ascii=False)`` to ``out``.
+
+    Iterator values anywhere in ``data`` are written as JSON arrays one
+    item at a time, so a lazy schema streams in constant memory; the bytes
+    are the same as dumping it with the iterators made lists.
+    """
+    from itertools import islice
+
+    streams = []
+    token = os.urandom(8).hex()
+
+    def mark(value):
+        if isinstance(value, str) or value is None or type(value) in (int, float, bool):
+            return value
+        if isinstance(value, dict):
+            return {k: mark(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [mark(v) for v in value]
+        if isinstance(value, Iterator):
+            streams.append(value)
+            return f"@@{token}:{len(streams) - 1}@@"
+        return value
+
+    text = json.dumps(mark(data), indent=indent, ensure_ascii=False)
+    for i, items in enumerate(streams):
+        head, text = text.split(f'"@@{token}:{i}@@"', 1)
+        out.write(head)
+        # Encode a batch as a list, then splice its body (items and separators,
+        # re-indented to the array's depth) between the stream's brackets
+        if indent is None:
+            separator, close, depth = ", ", "]", None
+        else:
+            line = head[head.rfind("\n") + 1:]
+            depth = " " * (len(line) - len(line.lstrip(" ")))
+            separator, close = ",", "\n" + depth + "]"
+        started = False
+        while batch := list(islice(items, DUMP_BATCH)):
+            chunk = json.dumps(batch, indent=indent, ensure_ascii=False)
+            if depth:
+                chunk = chunk.replace("\n", "\n" + depth)
+            out.write(separator if started else "[")
+            out.write(chunk[1:len(chunk) - len(close)])
+            started = True
+        out.write(close if started else "[]")
+    out.write(text)
+
+
+def iter_json_array(f, chunk_size: int = 1 << 16, prefix: str = "") -> Iterator:
+    """The items of the JSON array in text file ``f`` (after ``prefix``, text
+    already read from it), decoded one at a time."""
+    from json.decoder import WHITESPACE
+
+    decoder = json.JSONDecoder()
+    buf, pos, eof = prefix, 0, False
+    state = "open"      # then "first", then "next" and "item" in turn
+
+    def read():
+        nonlocal buf, pos, eof
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+    while True:
+        pos = WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ValueError("unexpected end of JSON array")
+            read()
+            continue
+        char = buf[pos]
+        if state == "open":
+            if char != "[":
+                raise ValueError("expected a JSON array")
+            pos, state = pos + 1, "first"
+        elif char == "]" and state in ("first", "next"):
+            return
+        elif state == "next":
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            pos, state = pos + 1, "item"
+        else:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # Incomplete, or a number the next chunk may go on with ("2." + "5")
+            if end is None or not eof and isinstance(item, (int, float)) and (
+                    end == len(buf) or buf[end] not in " \t\n\r,]"):
+                read()
+                continue
+            yield item
+            pos, state = end, "next"
+
+
+def freeze(value):
+    """A hashable, key-order-independent form of a JSON value."""
+    if isinstance(value, dict):
+        return tuple(sorted([(k, freeze(v)) for k, v in value.items()]))
+    if isinstance(value, list):
+        return tuple([freeze(v) for v in value])
+    return value
+
+
+class SiteGraph:
+    """A whole site's JSON-LD, with shared entities stated once.
+
+    Authors, publishers, logos and the WebSite become top-level nodes with
+    a stable ``@id`` (the site URL plus a digest of the node, so a rebuild
+    gives the same ids) and articles point at them by ``@id``. Output grows
+    with the pages plus the distinct entities, not pages times entities.
+    """
+
+    def __init__(self, site_url: str, site_name: Optional[str] = None):
+        self.site_url = site_url.rstrip("/") + "/"
+        self.entities: dict[str, dict] = {}     # @id -> node
+        self.refs: dict[tuple, dict] = {}       # frozen node -> {"@id"}
+        self.pages: list[dict] = []
+        self.used: set = set()                  # @ids referenced since last cleared
+        self.website = None
+        if site_name:
+            self.website = self.intern({"@type": "WebSite", "name": site_name, "url": self.site_url},
+                                       "#website")
+
+    def intern(self, node: dict, fragment: Optional[str] = None) -> dict:
+        """The ``{"@id"}`` reference for ``node``, adding it on first sight."""
+        key = freeze(node)
+        ref = self.refs.get(key)
+        if ref is None:
+            if fragment is None:
+                import hashlib
+
+                canonical = json.dumps(node, sort_keys=True, ensure_ascii=False)
+                digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+                fragment = f"#/schema/{node['@type'].lower()}/{digest}"
+            node_id = self.site_url + fragment
+            self.entities[node_id] = {"@id": node_id, **node}
+            ref = self.refs[key] = {"@id": node_id}
+        self.used.add(ref["@id"])
+        return ref
+
+    def page(self, config: dict) -> list[dict]:
+        """One page's combined-config nodes, shared entities replaced by references."""
+        nodes = generate_combined_schema(config)["@graph"]
+        for i, node in enumerate(nodes):
+            node.pop("@context", None)
+            if node["@type"] != "Article":
+                continue
+            node["author"] = self.intern(node["author"])
+            publisher = node.get("publisher")
+            if publisher:
+                if "logo" in publisher:
+                    publisher["logo"] = self.intern(publisher["logo"])
+                node["publisher"] = self.intern(publisher)
+            if self.website:
+                node["isPartOf"] = self.website
+            if "mainEntityOfPage" in node:
+                nodes[i] = {"@id": node["mainEntityOfPage"]["@id"] + "#article", **node}
+        return nodes
+
+    def add(self, config: dict) -> list[dict]:
+        """Add one page to the site graph; returns its nodes."""
+        nodes = self.page(config)
+        self.pages.extend(nodes)
+        return nodes
+
+    def shared(self) -> dict:
+        """The shared entities alone, as one JSON-LD document."""
+        return {"@context": "https://schema.org", "@graph": list(self.entities.values())}
+
+    def to_dict(self) -> dict:
+        """Shared entities followed by every page's nodes, as one JSON-LD document."""
+        return {"@context": "https://schema.org", "@graph": [*self.entities.values(), *self.pages]}
+
+
+# Validation: a rule table per @type, compiled once into checker closures.
+# Errors are {"path": JSON Pointer, "code", "message"}, in document order.
+
+SCHEMA_CONTEXTS = frozenset({"https://schema.org", "https://schema.org/",
+                             "http://schema.org", "http://schema.org/"})
+HEADLINE_MAX = 110
+
+
+class Validation:
+    """Errors, ``@id`` definitions and ``@id`` references of one document."""
+
+    __slots__ = ("errors", "ids", "refs")
+
+    def __init__(self):
+        self.errors: list[dict] = []
+        self.ids: set = set()
+        self.refs: list[tuple[str, str]] = []
+
+    def error(self, path: str, code: str, message: str):
+        self.errors.append({"path": path, "code": code, "message": message})
+
+
+@lru_cache(maxsize=None)
+def schema_rules() -> dict:
+    """The rules per @type, compiled on first use.
+
+    Written as ``{type: {key: (required, check)}}`` and compiled to
+    ``{type: ((key, "/key", required, check), ...)}``.
+    """
+    import re
+
+    date_pattern = re.compile(
+        r"\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])"
+        r"(T([01]\d|2[0-3]):[0-5]\d(:[0-5]\d(\.\d+)?)?(Z|[+-]([01]\d|2[0-3]):?[0-5]\d)?)?")
+    duration_pattern = re.compile(r"P(?=[\dT])(\d+Y)?(\d+M)?(\d+W)?(\d+D)?(T(?=\d)(\d+H)?(\d+M)?(\d+(\.\d+)?S)?)?")
+    url_pattern = re.compile(r"https?://[^\s/?#]+[^\s]*")
+
+    compiled = {}       # filled in below, read by node checks at run time
+
+    def text(max_length: Optional[int] = None):
+        def check(value, path, v):
+            if not isinstance(value, str):
+                v.error(path, "TYPE", "expected a string")
+            elif not value.strip():
+                v.error(path, "EMPTY", "must not be empty")
+            elif max_length and len(value) > max_length:
+                v.error(path, "TOO_LONG", f"{len(value)} characters, at most {max_length}")
+        return check
+
+    def matching(pattern, what: str):
+        def check(value, path, v):
+            if not isinstance(value, str):
+                v.error(path, "TYPE", "expected a string")
+            elif not pattern.fullmatch(value):
+                v.error(path, "FORMAT", f"expected {what}, got {value!r}")
+        return check
+
+    def integer(value, path, v):
+        if not isinstance(value, int) or isinstance(value, bool):
+            v.error(path, "TYPE", "expected an integer")
+
+    def node(*types: str, ref: bool = True):
+        """An object of one of ``types`` (or, if ``ref``, an ``{"@id"}`` reference)."""
+        expected = " or ".join(types)
+
+        def check(value, path, v):
+            if not isinstance(value, dict):
+                v.error(path, "TYPE", f"expected a {expected} node")
+            elif ref and len(value) == 1 and "@id" in value:
+                v.refs.append((path, value["@id"]))
+            elif value.get("@type") not in types:
+                if "@type" not in value:
+                    v.error(path + "/@type", "REQUIRED", f"missing, expected {expected}")
+                else:
+                    v.error(path + "/@type", "TYPE", f"expected {expected}, got {value['@type']!r}")
+            else:
+                check_node(value, path, v, compiled)
+        return check
+
+    def url_or(node_check):
+        """A URL string, or else a node."""
+        def check(value, path, v):
+            (url if isinstance(value, str) else node_check)(value, path, v)
+        return check
+
+    def many(item, min_items: int = 1, single: bool = False):
+        """A list of ``item`` (or, if ``single``, one bare ``item``)."""
+        def check(value, path, v):
+            if not isinstance(value, list):
+                if single:
+                    item(value, path, v)
+                else:
+                    v.error(path, "TYPE", "expected a list")
+            elif len(value) < min_items:
+                v.error(path, "EMPTY", f"needs at least {min_items} item(s)")
+            else:
+                for i, element in enumerate(value):
+                    item(element, f"{path}/{i}", v)
+        return check
+
+    list_items = many(node("ListItem", ref=False))
+
+    def item_list(value, path, v):
+        """ListItems whose positions run 1, 2, 3 ... in order."""
+        list_items(value, path, v)
+        if isinstance(value, list):
+            for i, element in enumerate(value):
+                if isinstance(element, dict) and isinstance(element.get("position"), int) \
+                        and element["position"] != i + 1:
+                    v.error(f"{path}/{i}/position", "POSITION", f"expected {i + 1}, got {element['position']}")
+
+    url = matching(url_pattern, "an absolute http(s) URL")
+    iso_date = matching(date_pattern, "an ISO 8601 date (YYYY-MM-DD[Thh:mm[:ss][zone]])")
+
+    def date(value, path, v):
+        before = len(v.errors)
+        iso_date(value, path, v)
+        if len(v.errors) == before:
+            from datetime import date as calendar
+
+            try:
+                calendar.fromisoformat(value[:10])
+            except ValueError:
+                v.error(path, "FORMAT", f"no such date: {value[:10]}")
+    duration = matching(duration_pattern, "an ISO 8601 duration such as PT30M")
+    image = many(url_or(node("ImageObject")), single=True)
+    party = many(node("Person", "Organization"), single=True)
+
+    article = {
+        "headline": (True, text(HEADLINE_MAX)),
+        "description": (False, text()),
+        "author": (True, party),
+        "publisher": (False, node("Organization")),
+        "image": (False, image),
+        "datePublished": (True, date),
+        "dateModified": (False, date),
+        "mainEntityOfPage": (False, url_or(node("WebPage"))),
+        "isPartOf": (False, node("WebSite")),
+    }
+    table = {
+        **dict.fromkeys(("Article", "BlogPosting", "NewsArticle", "TechArticle"), article),
+        "Person": {"name": (True, text()), "url": (False, url)},
+        "Organization": {"name": (True, text()), "url": (False, url), "logo": (False, image)},
+        "ImageObject": {"url": (True, url)},
+        "WebSite": {"name": (True, text()), "url": (True, url)},
+        "WebPage": {"@id": (True, url)},
+        "FAQPage": {"mainEntity": (True, many(node("Question", ref=False)))},
+        "Question": {"name": (True, text()), "acceptedAnswer": (True, node("Answer", ref=False))},
+        "Answer": {"text": (True, text())},
+        "HowTo": {
+            "name": (True, text()),
+            "description": (False, text()),
+            "step": (True, many(node("HowToStep", "HowToSection", ref=False))),
+            "totalTime": (False, duration),
+            "image": (False, image),
+            "tool": (False, many(node("HowToTool", ref=False), min_items=0)),
+            "supply": (False, many(node("HowToSupply", ref=False), min_items=0)),
+        },
+        "HowToStep": {"text": (True, text()), "name": (False, text()), "url": (False, url), "image": (False, image)},
+        "HowToSection": {"name": (True, text()), "itemListElement": (True, many(node("HowToStep", ref=False)))},
+        "HowToTool": {"name": (True, text())},
+        "HowToSupply": {"name": (True, text())},
+        "BreadcrumbList": {"itemListElement": (True, item_list)},
+        "ItemList": {"itemListElement": (True, item_list)},
+        "ListItem": {"position": (True, integer), "name": (False, text()),
+                     "item": (False, url_or(node("Thing", "WebPage"))), "url": (False, url)},
+    }
+    compiled.update((kind, tuple((key, "/" + key, required, check) for key, (required, check) in fields.items()))
+                    for kind, fields in table.items())
+    return compiled
+
+
+_ABSENT = object()
+
+
+def check_node(node: dict, path: str, v: Validation, rules: Optional[dict] = None):
+    """Check ``node`` against its @type's rules; other types pass unchecked."""
+    if "@id" in node:
+        v.ids.add(node["@id"])
+    for key, suffix, required, check in (rules or schema_rules()).get(node.get("@type"), ()):
+        value = node.get(key, _ABSENT)
+        if value is not _ABSENT:
+            check(value, path + suffix, v)
+        elif required:
+            v.error(path + suffix, "REQUIRED", "missing")
+
+
+def validate_schema(doc, known_ids: Optional[Container] = None) -> list[dict]:
+    """Errors in one JSON-LD document (a node, or an ``@graph`` of nodes).
+
+    ``@id`` references must resolve, to the document's own nodes or to
+    ``known_ids``, only when ``known_ids`` is given.
+    """
+    v = Validation()
+    rules = schema_rules()
+    if not isinstance(doc, dict):
+        v.error("", "TYPE", "expected a JSON object")
+        return v.errors
+    if doc.get("@context") not in SCHEMA_CONTEXTS:
+        v.error("/@context", "CONTEXT" if "@context" in doc else "REQUIRED", "expected https://schema.org")
+    if "@graph" in doc:
+        graph = doc["@graph"]
+        if not isinstance(graph, list):
+            v.error("/@graph", "TYPE", "expected a list")
+        elif not graph:
+            v.error("/@graph", "EMPTY", "needs at least 1 node")
+        for i, node in enumerate(graph if isinstance(graph, list) else ()):
+            path = f"/@graph/{i}"
+            if not isinstance(node, dict):
+                v.error(path, "TYPE", "expected a JSON object")
+            elif "@type" not in node:
+                v.error(path + "/@type", "REQUIRED", "missing")
+            else:
+                check_node(node, path, v, rules)
+    elif "@type" not in doc:
+        v.error("/@type", "REQUIRED", "missing (or an @graph)")
+    else:
+        check_node(doc, "", v, rules)
+    if known_ids is not None:
+        for path, ref in v.refs:
+            if ref not in v.ids and ref not in known_ids:
+                v.error(path + "/@id", "REF", f"unresolved reference {ref!r}")
+    return v.errors
+
+
+def check_page(schema: dict, config: dict, known_ids: Optional[Container] = None) -> list[dict]:
+    """:func:`validate_schema` for a page built from a combined ``config``,
+    plus the article title's truncation."""
+    errors = validate_schema(schema, known_ids)
+    if isinstance(config.get("article"), dict):
+        errors += check_headline(config["article"], "/@graph/0/headline")
+    return errors
+
+
+def check_headline(config: dict, path: str = "/headline") -> list[dict]:
+    """The truncation ``generate_article_schema`` does silently, as an error."""
+    title = config.get("title")
+    if isinstance(title, str) and len(title) > HEADLINE_MAX:
+        return [{"path": path, "code": "TRUNCATED",
+                 "message": f"title of {len(title)} characters cut to {HEADLINE_MAX}"}]
+    return []
+
+
+def validated(schema: dict, key: str, errors: list) -> dict:
+    """``schema`` with its streamed ``key`` entries checked as they go by.
+
+    The rest of the schema is checked at once; entry errors are added to
+    ``errors`` when the stream has been consumed.
+    """
+    errors.extend(e for e in validate_schema({**schema, key: []}) if e["path"] != f"/{key}")
+
+    def entries():
+        v = Validation()
+        count = 0
+        for count, entry in enumerate(schema[key], 1):
+            check_node(entry, f"/{key}/{count - 1}", v)
+            yield entry
+        if not count:
+            v.error(f"/{key}", "EMPTY", "needs at least 1 item(s)")
+        errors.extend(v.errors)
+
+    return {**schema, key: entries()}
+
+
+def read_manifest(f) -> Iterator:
+    """Entries of a batch manifest: the objects of a JSON array, or the raw
+    non-blank lines of NDJSON (streamed, and parsed by the worker)."""
+    head = f.read(1)
+    while head.isspace():
+        head = f.read(1)
+    if head == "[":
+        yield from json.loads(head + f.read())
+        return
+    if not head:
+        return
+    from itertools import chain
+
+    for line in chain([head + f.readline()], f):
+        if line.strip():
+            yield line
+
+
+def load_entry(index: int, entry) -> tuple[object, Optional[dict], Optional[str]]:
+    """Parse a manifest entry into ``(id, config, None)`` or ``(id, None, error)``."""
+    if isinstance(entry, str):
+        try:
+            entry = json.loads(entry)
+        except ValueError as e:
+            return index, None, f"invalid JSON: {e}"
+    if not isinstance(entry, dict):
+        return index, None, "expected a JSON object"
+    return entry.get("id", index), entry, None
+
+
+def output_path(out_dir: str, config: dict, page_id) -> Path:
+    """Where a page is written: its ``output``, else ``<id>.json``, under ``out_dir``."""
+    name = Path(str(config.get("output") or f"{page_id}.json"))
+    if name.is_absolute() or ".." in name.parts:
+        raise ValueError(f"output must stay inside the output directory: {name}")
+    return Path(out_dir, name)
+
+
+def write_json(path: Path, data: dict, indent: Optional[int]):
+    """Write ``data`` to ``path`` with :func:`dump_json`, atomically (tmp file, then rename)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            dump_json(data, f, indent)
+            f.write("\n")
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    os.replace(tmp, path)
+
+
+def build_page(item: tuple[int, object], out_dir: Optional[str], indent: Optional[int],
+               validate: bool = False) -> dict:
+    """Generate one manifest entry's combined schema.
+
+    An entry is a :func:`generate_combined_schema` config plus an optional
+    ``id`` (default: its position) and ``output`` path under ``out_dir``
+    (default: ``<id>.json``). Returns ``{"id", "schema"}``, ``{"id", "path"}``
+    once written, or ``{"id", "error"}``. With ``validate``, a page that
+    fails :func:`check_page` also gets its ``"validation"`` errors.
+    """
+    page_id, config, error = load_entry(*item)
+    if error:
+        return {"id": page_id, "error": error}
+    try:
+        schema = generate_combined_schema(config)
+    except KeyError as e:
+        return {"id": page_id, "error": f"missing key {e}"}
+    except (TypeError, ValueError, AttributeError) as e:
+        return {"id": page_id, "error": str(e)}
+    problems = check_page(schema, config) if validate else None
+    if out_dir is None:
+        record = {"id": page_id, "schema": schema}
+    else:
+        try:
+            path = output_path(out_dir, config, page_id)
+            write_json(path, schema, indent)
+        except (OSError, ValueError) as e:
+            return {"id": page_id, "error": str(e)}
+        record = {"id": page_id, "path": str(path)}
+    if problems:
+        record["validation"] = problems
+    return record
+
+
+def run_pool(func, items: Iterable, jobs: int, *args) -> Iterator:
+    """Apply ``func(item, *args)`` over a process pool, yielding as completed.
+
+    At most ``jobs * 4`` tasks are in flight; ``jobs == 1`` runs inline.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item, *args)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(func, item, *args))
+            if len(pending) >= jobs * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def run_manifest(manifest: str, out_dir: Optional[str], jobs: int, indent: Optional[int],
+                 validate: bool = False) -> int:
+    """Build every page of a manifest (``-`` for stdin), one NDJSON line each.
+
+    A bad entry yields an error line and the run goes on; a final
+    ``{"summary": ...}`` line gives the totals. Returns the exit code: 0 when
+    every entry was built (and, with ``validate``, is valid), 1 otherwise.
+    """
+    f = sys.stdin if manifest == "-" else open(manifest, "r", encoding="utf-8")
+    counts = {"pages": 0, "errors": 0, **({"invalid": 0} if validate else {})}
+    try:
+        for record in run_pool(build_page, enumerate(read_manifest(f)), jobs, out_dir, indent, validate):
+            counts["pages"] += 1
+            counts["errors"] += "error" in record
+            if "validation" in record:
+                counts["invalid"] += 1
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    print(json.dumps({"summary": counts}), flush=True)
+    return 1 if counts["errors"] or counts.get("invalid") else 0
+
+
+def run_site(manifest: str, site_url: str, site_name: Optional[str], out_dir: Optional[str],
+             indent: Optional[int], validate: bool = False) -> int:
+    """Build a manifest into one :class:`SiteGraph` (``-`` reads stdin).
+
+    Without ``out_dir`` the site graph is printed and per-entry errors go to
+    stderr as NDJSON. With it, ``site.json`` holds the shared entities, each
+    page's nodes go to their own file, and stdout gets one NDJSON line per
+    entry plus the summary. With ``validate``, each page is checked (its
+    references against the shared entities) and so are the shared entities
+    (as id ``site.json``); problems are reported as ``{"id", "validation"}``.
+    Returns 1 if any entry failed or is invalid, else 0.
+    """
+    site = SiteGraph(site_url, site_name)
+    log = sys.stderr if out_dir is None else sys.stdout
+    f = sys.stdin if manifest == "-" else open(manifest, "r", encoding="utf-8")
+    counts = {"pages": 0, "errors": 0, **({"invalid": 0} if validate else {}), "entities": 0}
+
+    def report(page_id, problems: list, record: Optional[dict] = None):
+        if problems:
+            counts["invalid"] += 1
+            record = {**(record or {"id": page_id}), "validation": problems}
+        if record:
+            print(json.dumps(record, ensure_ascii=False), file=log, flush=True)
+
+    try:
+        for index, entry in enumerate(read_manifest(f)):
+            counts["pages"] += 1
+            page_id, config, error = load_entry(index, entry)
+            if config is not None:
+                try:
+                    nodes = site.add(config) if out_dir is None else site.page(config)
+                    page = {"@context": "https://schema.org", "@graph": nodes}
+                    if out_dir is not None:
+                        path = output_path(out_dir, config, page_id)
+                        write_json(path, page, indent)
+                except KeyError as e:
+                    error = f"missing key {e}"
+                except (OSError, TypeError, ValueError, AttributeError) as e:
+                    error = str(e)
+            if error:
+                counts["errors"] += 1
+                print(json.dumps({"id": page_id, "error": error}, ensure_ascii=False), file=log, flush=True)
+            else:
+                report(page_id, check_page(page, config, site.entities) if validate else [],
+                       {"id": page_id, "path": str(path)} if out_dir is not None else None)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    counts["entities"] = len(site.entities)
+    if validate and site.entities:
+        report("site.json", validate_schema(site.shared(), site.entities))
+    if out_dir is None:
+        print(json.dumps(site.to_dict(), indent=indent, ensure_ascii=False))
+    else:
+        write_json(Path(out_dir, "site.json"), site.shared(), indent)
+    print(json.dumps({"summary": counts}), file=log, flush=True)
+    return 1 if counts["errors"] or counts.get("invalid") else 0
+
+
+def lazy_schema(args, source) -> dict:
+    """The faq/howto/breadcrumb/itemlist schema of ``args``, its entries an
+    iterator over the input array. A HowTo input object (``steps`` plus
+    ``totalTime``, ``tools``, ``supplies``) is read whole."""
+    if args.type == "howto":
+        head = source.read(1)
+        while head.isspace():
+            head = source.read(1)
+        if head != "[":
+            data = json.loads(head + source.read())
+            return generate_howto_schema(
+                title=args.title,
+                description=args.description,
+                steps=data.get("steps", data),
+                total_time=data.get("totalTime"),
+                tools=data.get("tools"),
+                supplies=data.get("supplies"),
+            )
+        entries = iter_json_array(source, prefix=head)
+        return generate_howto_schema(title=args.title, description=args.description,
+                                     steps=entries, lazy=True)
+    entries = iter_json_array(source)
+    if args.type == "faq":
+        return generate_faq_schema(entries, lazy=True)
+    if args.type == "breadcrumb":
+        return generate_breadcrumb_schema(entries, lazy=True)
+    return generate_itemlist_schema(entries, name=args.title, lazy=True)
+
+
+BUILD_STATE = ".schema-build.json"
+BUILD_VERSION = 2
+
+
+def page_crumb(config: dict) -> Optional[list]:
+    """A page's own breadcrumb, ``[name, url]``: its ``name``/``url``, else its
+    article's title and canonical URL; ``None`` without both."""
+    article = config.get("article") if isinstance(config.get("article"), dict) else {}
+    name = config.get("name") or article.get("title")
+    url = config.get("url") or article.get("canonical_url")
+    return [name, url] if name and url else None
+
+
+def expand_page(config: dict, entities: dict, trail: Optional[list]) -> dict:
+    """A build entry as a :func:`generate_combined_schema` config.
+
+    The article's ``shared`` entity names are replaced by their fields (the
+    article's own fields win), and a page with a ``parent`` but no
+    ``breadcrumbs`` gets its ancestors' ``trail``.
+    """
+    config = dict(config)
+    article = config.get("article")
+    if isinstance(article, dict) and "shared" in article:
+        merged = {}
+        for name in article["shared"]:
+            if name not in entities:
+                raise ValueError(f"unknown shared entity {name!r}")
+            merged.update(entities[name])
+        merged.update((k, v) for k, v in article.items() if k != "shared")
+        config["article"] = merged
+    if trail is not None and not config.get("breadcrumbs"):
+        config["breadcrumbs"] = [{"name": name, "url": url} for name, url in trail]
+    return config
+
+
+def run_build(manifest: str, site_url: str, site_name: Optional[str], entities_path: Optional[str],
+              out_dir: str, indent: Optional[int], force: bool = False, validate: bool = False) -> int:
+    """Build a site graph into ``out_dir``, regenerating only what changed.
+
+    ``out_dir/.schema-build.json`` keeps, per page, a digest of its manifest
+    entry and of its dependencies: the ``--entities`` it shares and its
+    parent trail. A page is rebuilt when either digest changes, so an
+    edited shared author or logo, or a renamed ancestor, fans out to exactly
+    the pages using it; unchanged entries are not even parsed. Pages gone
+    from the manifest have their output removed. ``force`` rebuilds all.
+    Prints built, removed and failed pages as NDJSON, then the summary.
+    """
+    import hashlib
+
+    def digest(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+    entities = {}
+    if entities_path:
+        with open(entities_path, "r", encoding="utf-8") as f:
+            entities = json.load(f)
+    entity_digests = {name: digest(json.dumps(fields, sort_keys=True, ensure_ascii=False))
+                      for name, fields in entities.items()}
+    site_digest = digest(json.dumps([BUILD_VERSION, site_url, site_name, indent]))
+    state_path = Path(out_dir, BUILD_STATE)
+    previous = {"pages": {}, "entities": [], "shared": None}
+    if not force and state_path.exists():
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("site") == site_digest:
+            previous = state
+    # id -> [entry digest, dependencies digest, output, parent, shared, refs], where refs
+    # index previous["entities"], the shared nodes the pages use
+    old_entities = [node["@id"] for node in previous["entities"]]
+    old_pages = previous["pages"]
+    by_entry = {page[0]: page_id for page_id, page in old_pages.items()}
+    counts = {"pages": 0, "built": 0, "unchanged": 0, "removed": 0, "errors": 0,
+              **({"invalid": 0} if validate else {}), "entities": 0}
+
+    def emit(record: dict):
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    def fail(page_id, error: str):
+        counts["errors"] += 1
+        emit({"id": page_id, "error": error})
+
+    # Pass 1: identify every page; only new or edited entries are parsed
+    pages = {}      # id -> [entry digest, raw entry, config (None: not parsed), parent, shared]
+    unidentified = False
+    f = sys.stdin if manifest == "-" else open(manifest, "r", encoding="utf-8")
+    try:
+        for index, entry in enumerate(read_manifest(f)):
+            counts["pages"] += 1
+            entry_digest = digest(entry.strip() if isinstance(entry, str)
+                                  else json.dumps(entry, sort_keys=True, ensure_ascii=False))
+            known = by_entry.get(entry_digest)
+            if known is not None and known not in pages:
+                old = old_pages[known]
+                pages[known] = [entry_digest, entry, None, old[3], old[4]]
+                continue
+            page_id, config, error = load_entry(index, entry)
+            page_id = str(page_id)
+            if error:
+                unidentified = True
+                fail(page_id, error)
+            elif page_id in pages:
+                fail(page_id, "duplicate id")
+            else:
+                article = config.get("article")
+                parent = config.get("parent")
+                pages[page_id] = [entry_digest, entry, config, None if parent is None else str(parent),
+                                  article.get("shared", []) if isinstance(article, dict) else []]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    def config_of(page_id: str) -> dict:
+        page = pages[page_id]
+        if page[2] is None:
+            page[2] = load_entry(0, page[1])[1]
+        return page[2]
+
+    # Parent trails: (crumbs root..page or None, digest), parsing only parents
+    trails: dict[str, tuple] = {}
+
+    def trail(page_id: str, seen: frozenset = frozenset()) -> tuple:
+        if page_id in trails:
+            return trails[page_id]
+        if page_id not in pages:
+            raise ValueError(f"unknown parent {page_id!r}")
+        if page_id in seen:
+            raise ValueError(f"parent cycle through {page_id!r}")
+        parent = pages[page_id][3]
+        if parent is None:
+            above, above_digest = [], ""
+        else:
+            above, above_digest = trail(parent, seen | {page_id})
+        crumb = page_crumb(config_of(page_id))
+        if crumb is None or above is None:
+            result = (None, digest(above_digest + "|-"))
+        else:
+            result = (above + [crumb], digest(above_digest + "|" + json.dumps(crumb, ensure_ascii=False)))
+        trails[page_id] = result
+        return result
+
+    # Pass 2: rebuild pages whose entry or dependencies changed
+    site = SiteGraph(site_url, site_name)
+    site_refs = set(site.used)
+    new_pages = {}
+    built_refs = {}     # id -> @ids of the shared nodes a rebuilt page uses
+    dependencies = {}   # (trail digest, shared names) -> digest, few distinct
+    for page_id, (entry_digest, entry, config, parent, shared) in pages.items():
+        try:
+            above = trail(parent) if parent is not None else (None, "")
+            if parent is not None and above[0] is None:
+                raise ValueError(f"an ancestor of {page_id!r} lacks a name or url for breadcrumbs")
+        except ValueError as e:
+            fail(page_id, str(e))
+            continue
+        key = (above[1], *shared)
+        inputs = dependencies.get(key)
+        if inputs is None:
+            inputs = dependencies[key] = digest("|".join(
+                [site_digest, above[1], *(entity_digests.get(name, "?") for name in shared)]))
+        old = old_pages.get(page_id)
+        if old is not None and old[0] == entry_digest and old[1] == inputs:
+            counts["unchanged"] += 1
+            new_pages[page_id] = old
+            continue
+        config = config_of(page_id)
+        try:
+            crumb = page_crumb(config)
+            expanded = expand_page(config, entities,
+                                   None if parent is None else above[0] + ([crumb] if crumb else []))
+            site.used = set()
+            nodes = site.page(expanded)
+            page = {"@context": "https://schema.org", "@graph": nodes}
+            path = output_path(out_dir, config, page_id)
+            write_json(path, page, indent)
+        except KeyError as e:
+            fail(page_id, f"missing key {e}")
+            continue
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            fail(page_id, str(e))
+            continue
+        if old is not None and old[2] != str(path):
+            Path(old[2]).unlink(missing_ok=True)
+        counts["built"] += 1
+        new_pages[page_id] = [entry_digest, inputs, str(path), parent, shared, None]
+        built_refs[page_id] = site.used | site_refs
+        record = {"id": page_id, "path": str(path)}
+        if validate:
+            problems = check_page(page, expanded, site.entities)
+            if problems:
+                counts["invalid"] += 1
+                record["validation"] = problems
+        emit(record)
+
+    # Pages that left the manifest. Failed pages keep their last good output,
+    # and nothing is removed while an unreadable entry may be any page.
+    for page_id, old in old_pages.items():
+        if page_id not in new_pages:
+            if unidentified or page_id in pages:
+                new_pages[page_id] = old
+                continue
+            Path(old[2]).unlink(missing_ok=True)
+            counts["removed"] += 1
+            emit({"id": page_id, "removed": old[2]})
+
+    # Shared entities: those some page still uses, rewritten only on change
+    known = {node["@id"]: node for node in previous["entities"]}
+    known.update(site.entities)
+    kept = {i for page_id, page in new_pages.items() if page_id not in built_refs for i in page[5]}
+    live = set().union({old_entities[i] for i in kept}, *built_refs.values())
+    shared_nodes = [node for node_id, node in known.items() if node_id in live]
+    counts["entities"] = len(shared_nodes)
+    shared_digest = digest(json.dumps(shared_nodes, sort_keys=True, ensure_ascii=False))
+    if shared_digest != previous["shared"] or not Path(out_dir, "site.json").exists():
+        write_json(Path(out_dir, "site.json"), {"@context": "https://schema.org", "@graph": shared_nodes}, indent)
+    if counts["built"] or counts["removed"] or shared_digest != previous["shared"]:
+        index = {node["@id"]: i for i, node in enumerate(shared_nodes)}
+        remap = [index.get(node_id) for node_id in old_entities]
+        same = remap == list(range(len(remap)))
+        for page_id, page in new_pages.items():
+            if page_id in built_refs:
+                page[5] = sorted(index[node_id] for node_id in built_refs[page_id])
+            elif not same:
+                new_pages[page_id] = [*page[:5], sorted(remap[i] for i in page[5])]
+        # One json.dumps call: json.dump would take the pure-Python encoder
+        tmp = f"{state_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": BUILD_VERSION, "site": site_digest, "shared": shared_digest,
+                                "entities": shared_nodes, "pages": new_pages}, ensure_ascii=False))
+        os.replace(tmp, state_path)
+    emit({"summary": counts})
+    return 1 if counts["errors"] or counts.get("invalid") else 0
+
+
+def build_main(argv: list[str]):
+    """Entry point for ``schema-generator.py build``: incremental site graph build."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="schema-generator.py build",
+        description="Build a site graph into a directory, regenerating only pages whose inputs changed",
+    )
+    parser.add_argument("manifest", help="JSON array or NDJSON of page configs, - for stdin")
+    parser.add_argument("--out-dir", required=True, metavar="DIR", help="Output directory (keeps the build state)")
+    parser.add_argument("--site-url", required=True, help="Site URL the shared @ids hang off")
+    parser.add_argument("--site-name", help="Site name, adding a WebSite node")
+    parser.add_argument("--entities", metavar="FILE",
+                        help='JSON of named article fields pages share via "shared": [names]')
+    parser.add_argument("--force", action="store_true", help="Rebuild every page")
+    parser.add_argument("--pretty", action="store_true", help="Pretty print output files")
+    parser.add_argument("--validate", action="store_true", help="Check rebuilt pages, exit 1 on problems")
+    args = parser.parse_args(argv)
+
+    try:
+        code = run_build(args.manifest, args.site_url, args.site_name, args.entities, args.out_dir,
+                         2 if args.pretty else None, args.force, args.validate)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(code)
+
+
+# The streamed entry list of each --input type
+STREAM_KEYS = {"faq": "mainEntity", "howto": "step", "breadcrumb": "itemListElement",
+               "itemlist": "itemListElement"}
+
+
+def report_problems(problems: list[dict]):
+    """Print --validate problems to stderr, one NDJSON line each; exit 1 if any."""
+    for problem in problems:
+        print(json.dumps(problem, ensure_ascii=False), file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+def validate_files(paths: list[str], known_ids: Optional[Container]) -> list[dict]:
+    """Validate files: ``.json``/``.jsonld`` hold one document, ``.ndjson``
+    one per line (either a schema or a manifest run's ``{"id", "schema"}``)."""
+    records = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if not path.endswith(".ndjson"):
+                    errors = validate_schema(json.load(f), known_ids)
+                    records.append({"file": path, "valid": not errors, "errors": errors})
+                    continue
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    record = {"file": path, "line": number}
+                    doc = json.loads(line)
+                    if isinstance(doc, dict) and "@context" not in doc:
+                        if "schema" not in doc:
+                            continue    # a manifest run's error or summary line
+                        record["id"], doc = doc.get("id"), doc["schema"]
+                    errors = validate_schema(doc, known_ids)
+                    records.append({**record, "valid": not errors, "errors": errors})
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            records.append({"file": path, "valid": False,
+                            "errors": [{"path": "", "code": "JSON", "message": str(e)}]})
+    return records
+
+
+def validate_main(argv: list[str]):
+    """Entry point for ``schema-generator.py validate``: check generated schema files."""
+    import argparse
+    from itertools import islice
+
+    parser = argparse.ArgumentParser(
+        prog="schema-generator.py validate",
+        description="Validate JSON-LD files (.json, .jsonld, .ndjson) or directories of them",
+    )
+    parser.add_argument("paths", nargs="+", metavar="path", help="Files or directories")
+    parser.add_argument("--shared", nargs="+", metavar="FILE", default=[],
+                        help="Documents whose @ids references may point at (e.g. site.json); "
+                             "references are then checked")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--errors-only", action="store_true", help="Only print invalid documents")
+    args = parser.parse_args(argv)
+
+    known_ids = None
+    if args.shared:
+        known_ids = set()
+        for path in args.shared:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    doc = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(2)
+            for node in doc.get("@graph", [doc]) if isinstance(doc, dict) else ():
+                if isinstance(node, dict) and "@id" in node:
+                    known_ids.add(node["@id"])
+
+    def files():
+        for target in args.paths:
+            if Path(target).is_dir():
+                for path in sorted(Path(target).rglob("*")):
+                    # Skips dotfiles such as the build state, .schema-build.json
+                    if (path.suffix in (".json", ".jsonld", ".ndjson") and not path.name.startswith(".")
+                            and path.is_file()):
+                        yield str(path)
+            else:
+                yield target
+
+    def batches(paths, size: int = 64):
+        paths = iter(paths)
+        while batch := list(islice(paths, size)):
+            yield batch
+
+    counts = {"documents": 0, "invalid": 0, "errors": 0}
+    for records in run_pool(validate_files, batches(files()), args.jobs, known_ids):
+        for record in records:
+            counts["documents"] += 1
+            counts["invalid"] += not record["valid"]
+            counts["errors"] += len(record["errors"])
+            if not (args.errors_only and record["valid"]):
+                print(json.dumps(record, ensure_ascii=False))
+    print(json.dumps({"summary": counts}), flush=True)
+    sys.exit(1 if counts["invalid"] else 0)
+
+
+def main():
+    if sys.argv[1:2] == ["validate"]:
+        validate_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["build"]:
+        build_main(sys.argv[2:])
+        return
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate JSON-LD Schema")
+    parser.add_argument(
+        "--type",
+        choices=["article", "faq", "howto", "breadcrumb", "itemlist", "combined", "site"],
+        required=True,
+        help="Schema type to generate"
+    )
+    parser.add_argument("--config", help="JSON config file path")
+    parser.add_argument("--title", help="Content title")
+    parser.add_argument("--description", help="Content description")
+    parser.add_argument("--author", help="Author name")
+    parser.add_argument("--author-type", default="Organization", help="Author type")
+    parser.add_argument("--author-url", help="Author URL")
+    parser.add_argument("--publisher", help="Publisher name")
+    parser.add_argument("--publisher-logo", help="Publisher logo URL")
+    parser.add_argument("--image", help="Cover image URL")
+    parser.add_argument("--url", help="Canonical URL")
+    parser.add_argument("--date-published", help="Publish date (YYYY-MM-DD)")
+    parser.add_argument("--date-modified", help="Modified date (YYYY-MM-DD)")
+    parser.add_argument("--entity", help="Primary entity name")
+    parser.add_argument("--secondary-entities", help="Comma-separated secondary entities")
+    parser.add_argument("--input", help="Input JSON file for FAQs/steps/items, - for stdin")
+    parser.add_argument("--output", metavar="PATH", help="Write the schema to PATH (atomically) instead of stdout")
+    parser.add_argument("--pretty", action="store_true", help="Pretty print output")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="Batch mode: JSON array or NDJSON of combined configs, - for stdin")
+    parser.add_argument("--out-dir", metavar="DIR",
+                        help="Write each manifest page to DIR/<id>.json instead of NDJSON on stdout")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for --manifest (default: 1)")
+    parser.add_argument("--site-url", help="Site URL the shared @ids of --type site hang off")
+    parser.add_argument("--site-name", help="Site name, adding a WebSite node for --type site")
+    parser.add_argument("--validate", action="store_true",
+                        help="Check the generated schema, report problems as NDJSON and exit 1 on any")
+
+    args = parser.parse_args()
+
+    if args.type == "site":
+        if not args.manifest or not args.site_url:
+            parser.error("site requires --manifest and --site-url")
+        try:
+            code = run_site(args.manifest, args.site_url, args.site_name, args.out_dir,
+                            2 if args.pretty else None, args.validate)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(code)
+    if args.manifest:
+        if args.type != "combined":
+            parser.error("--manifest requires --type combined")
+        try:
+            code = run_manifest(args.manifest, args.out_dir, args.jobs, 2 if args.pretty else None,
+                                args.validate)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(code)
+    if args.out_dir:
+        parser.error("--out-dir requires --manifest")
+
+    schema = None
+    problems = []
+
+    if args.type == "combined" and args.config:
+        with open(args.config, "r") as f:
+            config = json.load(f)
+        schema = generate_combined_schema(config)
+        if args.validate:
+            problems = check_page(schema, config)
+
+    elif args.type == "article":
+        if not args.title or not args.description or not args.author:
+            parser.error("article requires --title, --description, and --author")
+
+        secondary = args.secondary_entities.split(",") if args.secondary_entities else None
+        schema = generate_article_schema(
+            title=args.title,
+            description=args.description,
+            author_name=args.author,
+            author_type=args.author_type,
+            author_url=args.author_url,
+            publisher_name=args.publisher,
+            publisher_logo=args.publisher_logo,
+            image_url=args.image,
+            date_published=args.date_published,
+            date_modified=args.date_modified,
+            canonical_url=args.url,
+            primary_entity=args.entity,
+            secondary_entities=secondary,
+        )
+        if args.validate:
+            problems = validate_schema(schema) + check_headline({"title": args.title})
+
+    elif args.type in ("faq", "howto", "breadcrumb", "itemlist"):
+        # Streamed: entries go from the input array to the output one at a time
+        if not args.input:
+            parser.error(f"{args.type} requires --input with JSON file")
+        if args.type == "howto" and (not args.title or not args.description):
+            parser.error("howto requires --input, --title, and --description")
+        source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+        try:
+            schema = lazy_schema(args, source)
+            if args.validate:
+                schema = validated(schema, STREAM_KEYS[args.type], problems)
+            indent = 2 if args.pretty else None
+            if args.output:
+                write_json(Path(args.output), schema, indent)
+            else:
+                dump_json(schema, sys.stdout, indent)
+                sys.stdout.write("\n")
+        except KeyError as e:
+            print(f"Error: missing key {e}", file=sys.stderr)
+            sys.exit(2)
+        except (OSError, TypeError, ValueError, AttributeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        report_problems(problems)
+        return
+
+    if schema:
+        indent = 2 if args.pretty else None
+        if args.output:
+            write_json(Path(args.output), schema, indent)
+        else:
+            print(json.dumps(schema, indent=indent, ensure_ascii=False))
+        report_problems(problems)
+    else:
+        parser.error("Could not generate schema. Check arguments.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()